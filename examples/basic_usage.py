@@ -2,11 +2,92 @@
 
 import asyncio
 import os
+import sys
 from datetime import datetime, timedelta
 
 from pyflume_influxdb import FlumeClient
 from pyflume_influxdb.models import WaterUsageQuery
 
+# Datetime format expected by the Flume query API
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+async def process_device(client, device):
+    """Fetch everything for one device and return its report as a string."""
+    lines = [f"\nDevice: {device.id}"]
+    lines.append(f"Type: {'Bridge' if device.type == 1 else 'Water Sensor'}")
+    lines.append(f"Status: {'Connected' if device.connected else 'Disconnected'}")
+    lines.append(f"Last seen: {device.last_seen}")
+
+    if device.type != 2:  # Only water sensors report usage
+        return "\n".join(lines)
+
+    # Query last day's water usage
+    now = datetime.now()
+    yesterday = now - timedelta(days=1)
+    since = yesterday.strftime(DATETIME_FORMAT)
+    until = now.strftime(DATETIME_FORMAT)
+
+    queries = [
+        # Hourly data for the last day
+        WaterUsageQuery(
+            request_id="hourly",
+            bucket="HR",
+            since_datetime=since,
+            until_datetime=until,
+            operation="SUM",
+            units="GALLONS",
+        ),
+        # Daily total
+        WaterUsageQuery(
+            request_id="daily",
+            bucket="DAY",
+            since_datetime=since,
+            until_datetime=until,
+            operation="SUM",
+            units="GALLONS",
+        ),
+    ]
+
+    # The four lookups are independent, so issue them concurrently
+    flow, (hourly, daily), rules, alerts = await asyncio.gather(
+        client.get_current_flow(device.id),
+        client.query_water_usage(device.id, queries),
+        client.get_alert_rules(device.id),
+        client.get_usage_alerts(
+            device_id=device.id,
+            sort_direction="DESC",
+            limit=5,
+        ),
+    )
+
+    lines.append(f"\nCurrent flow status:")
+    lines.append(f"Active: {flow['active']}")
+    lines.append(f"Flow rate: {flow['gpm']} GPM")
+    lines.append(f"As of: {flow['datetime']}")
+
+    lines.append("\nWater usage:")
+    lines.append("Hourly breakdown:")
+    for reading in hourly:
+        lines.append(f"  {reading.datetime}: {reading.value:.1f} gallons")
+
+    if daily:
+        daily_total = daily[0].value
+        lines.append(f"\nTotal usage (24h): {daily_total:.1f} gallons")
+
+    lines.append(f"\nAlert rules ({len(rules)}):")
+    for rule in rules:
+        lines.append(f"- {rule.name}: {rule.flow_rate} GPM for {rule.duration} minutes")
+
+    lines.append(f"\nRecent alerts ({len(alerts)}):")
+    for alert in alerts:
+        alert_type = "LEAK" if alert.flume_leak else "Flow"
+        lines.append(
+            f"- [{alert_type}] {alert.triggered_datetime}: " f"{alert.event_rule_name}"
+        )
+
+    return "\n".join(lines)
+
 
 async def main():
     """Demonstrate basic usage of the FlumeClient."""
@@ -15,16 +96,16 @@ async def main():
     client_secret = os.getenv("FLUME_CLIENT_SECRET")
     username = os.getenv("FLUME_USERNAME")
     password = os.getenv("FLUME_PASSWORD")
-    
+
     # Optional InfluxDB configuration
     influxdb_url = os.getenv("INFLUXDB_URL")
     influxdb_token = os.getenv("INFLUXDB_TOKEN")
     influxdb_org = os.getenv("INFLUXDB_ORG")
     influxdb_bucket = os.getenv("INFLUXDB_BUCKET")
-    
+
     if not all([client_id, client_secret, username, password]):
         raise ValueError("Missing required Flume credentials in environment variables")
-    
+
     async with FlumeClient(
         client_id=client_id,
         client_secret=client_secret,
@@ -38,77 +119,12 @@ async def main():
         # Get all devices
         devices = await client.get_devices(include_location=True)
         print(f"\nFound {len(devices)} devices:")
-        
-        for device in devices:
-            print(f"\nDevice: {device.id}")
-            print(f"Type: {'Bridge' if device.type == 1 else 'Water Sensor'}")
-            print(f"Status: {'Connected' if device.connected else 'Disconnected'}")
-            print(f"Last seen: {device.last_seen}")
-            
-            if device.type == 2:  # Water sensor
-                # Get current flow status
-                flow = await client.get_current_flow(device.id)
-                print(f"\nCurrent flow status:")
-                print(f"Active: {flow['active']}")
-                print(f"Flow rate: {flow['gpm']} GPM")
-                print(f"As of: {flow['datetime']}")
-                
-                # Query last day's water usage
-                now = datetime.now()
-                yesterday = now - timedelta(days=1)
-                
-                queries = [
-                    # Hourly data for the last day
-                    WaterUsageQuery(
-                        request_id="hourly",
-                        bucket="HR",
-                        since_datetime=yesterday.strftime("%Y-%m-%d %H:%M:%S"),
-                        until_datetime=now.strftime("%Y-%m-%d %H:%M:%S"),
-                        operation="SUM",
-                        units="GALLONS",
-                    ),
-                    # Daily total
-                    WaterUsageQuery(
-                        request_id="daily",
-                        bucket="DAY",
-                        since_datetime=yesterday.strftime("%Y-%m-%d %H:%M:%S"),
-                        until_datetime=now.strftime("%Y-%m-%d %H:%M:%S"),
-                        operation="SUM",
-                        units="GALLONS",
-                    ),
-                ]
-                
-                usage = await client.query_water_usage(device.id, queries)
-                
-                print("\nWater usage:")
-                print("Hourly breakdown:")
-                for reading in usage["hourly"]:
-                    print(f"  {reading.datetime}: {reading.value:.1f} gallons")
-                    
-                if usage["daily"]:
-                    daily_total = usage["daily"][0].value
-                    print(f"\nTotal usage (24h): {daily_total:.1f} gallons")
-                
-                # Get alert rules
-                rules = await client.get_alert_rules(device.id)
-                print(f"\nAlert rules ({len(rules)}):")
-                for rule in rules:
-                    print(f"- {rule.name}: {rule.flow_rate} GPM for {rule.duration} minutes")
-                
-                # Get recent alerts
-                alerts = await client.get_usage_alerts(
-                    device_id=device.id,
-                    sort_direction="DESC",
-                    limit=5,
-                )
-                print(f"\nRecent alerts ({len(alerts)}):")
-                for alert in alerts:
-                    alert_type = "LEAK" if alert.flume_leak else "Flow"
-                    print(
-                        f"- [{alert_type}] {alert.triggered_datetime}: "
-                        f"{alert.event_rule_name}"
-                    )
+
+        reports = await asyncio.gather(
+            *(process_device(client, device) for device in devices)
+        )
+        sys.stdout.write("\n".join(reports) + "\n")
 
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    asyncio.run(main())
@@ -2,54 +2,107 @@
 
 import asyncio
 import os
-from datetime import datetime, timedelta
+import sys
 
 from pyflume_influxdb import FlumeClient
 
+# Maximum number of Flume API requests in flight across all devices
+MAX_CONCURRENT_REQUESTS = 8
+
+# Seconds between usage alert checks for each device
+ALERT_CHECK_INTERVAL = 60
+
+
+async def poll_all(client, devices, queues, semaphore, interval=10):
+    """Poll every water sensor once per tick and hand results to its monitor."""
+    loop = asyncio.get_running_loop()
+
+    async def fetch(device):
+        async with semaphore:
+            return await client.get_current_flow(device.id)
+
+    next_tick = loop.time()
+    while True:
+        flows = await asyncio.gather(
+            *(fetch(device) for device in devices), return_exceptions=True
+        )
+
+        for device, flow in zip(devices, flows):
+            if isinstance(flow, Exception):
+                print(f"\nError polling device {device.id}: {flow}")
+                continue
+            if client.influxdb_enabled:  # Only write if InfluxDB is configured
+                await client.write_to_influxdb(device.id, flow)
+            queue = queues[device.id]
+            if queue.full():
+                # The monitor hasn't taken the last reading; replace it
+                queue.get_nowait()
+            queue.put_nowait(flow)
+
+        if client.influxdb_enabled:
+            # Send this tick's readings for all devices as one batch
+            await client.flush()
+            print("📤 Data queued for InfluxDB")
+
+        # Wait 10 seconds before next check to respect API limits; after an
+        # overrun, skip the missed ticks rather than firing a burst
+        next_tick += interval
+        now = loop.time()
+        if next_tick < now:
+            next_tick += (now - next_tick) // interval * interval + interval
+        await asyncio.sleep(next_tick - now)
 
-async def monitor_device(client, device):
-    """Monitor a single device's water usage and flow data."""
-    print(f"\nMonitoring Device ID: {device.id}")
-    print(f"Type: {'Bridge' if device.type == 1 else 'Water Sensor'}")
-    print(f"Status: {'Connected' if device.connected else 'Disconnected'}")
-    print(f"Last seen: {device.last_seen}")
-    print(f"Battery: {device.battery_level}")
 
-    if device.type != 2:  # Skip if not a water sensor
-        return
+async def monitor_device(client, device, queue, semaphore):
+    """Monitor a single device's water usage and flow data."""
+    print(
+        f"\nMonitoring Device ID: {device.id}\n"
+        f"Type: {'Bridge' if device.type == 1 else 'Water Sensor'}\n"
+        f"Status: {'Connected' if device.connected else 'Disconnected'}\n"
+        f"Last seen: {device.last_seen}\n"
+        f"Battery: {device.battery_level}"
+    )
 
-    last_alert_time = None
+    # Alert checks are scheduled on the loop's monotonic clock so wall-clock
+    # jumps cannot skip or repeat them
+    loop = asyncio.get_running_loop()
+    last_alert_time = loop.time() - ALERT_CHECK_INTERVAL
 
     try:
         while True:
-            # Get current flow status and store in InfluxDB
-            current_flow = await client.get_current_flow(device.id)
-            if client._write_api:  # Only write if InfluxDB is configured
-                await client.write_to_influxdb(device.id, current_flow)
-                print("✅ Data stored in InfluxDB")
-            
-            print(f"\n🚰 Flow Status @ {current_flow['datetime']}")
-            print(f"Active: {'Yes' if current_flow['active'] else 'No'}")
-            print(f"Flow rate: {current_flow['gpm']:.2f} GPM")
+            # Wait for the next flow reading from the poller
+            current_flow = await queue.get()
+
+            # Each report is written in one call so concurrent monitors
+            # cannot interleave their lines
+            flow_datetime = current_flow["datetime"]
+            flow_active = current_flow["active"]
+            flow_gpm = current_flow["gpm"]
+            lines = [
+                f"\n🚰 Flow Status @ {flow_datetime}",
+                f"Active: {'Yes' if flow_active else 'No'}",
+                f"Flow rate: {format(flow_gpm, '.2f')} GPM",
+            ]
 
             # Check for new alerts every minute
-            current_time = datetime.fromisoformat(current_flow['datetime'].replace(' ', 'T'))
-            if last_alert_time is None or (current_time - last_alert_time) > timedelta(minutes=1):
-                alerts = await client.get_usage_alerts(
-                    device_id=device.id,
-                    sort_direction="DESC",
-                    limit=5
-                )
-                
+            now = loop.time()
+            if now - last_alert_time >= ALERT_CHECK_INTERVAL:
+                async with semaphore:
+                    alerts = await client.get_usage_alerts(
+                        device_id=device.id, sort_direction="DESC", limit=5
+                    )
+
                 if alerts:
-                    print("\n🚨 Recent Alerts:")
+                    lines.append("\n🚨 Recent Alerts:")
                     for alert in alerts:
                         alert_type = "LEAK" if alert.flume_leak else "Flow"
-                        print(f"- [{alert_type}] {alert.triggered_datetime}: {alert.event_rule_name}")
-                
-                last_alert_time = current_time
+                        lines.append(
+                            f"- [{alert_type}] {alert.triggered_datetime}: {alert.event_rule_name}"
+                        )
 
-            await asyncio.sleep(10)  # Wait 30 seconds before next check to respect API limits
+                last_alert_time = now
+
+            sys.stdout.write("\n".join(lines) + "\n")
 
     except asyncio.CancelledError:
         print(f"\nStopped monitoring device {device.id}")
@@ -64,17 +117,17 @@ async def main():
     client_secret = os.getenv("FLUME_CLIENT_SECRET")
     username = os.getenv("FLUME_USERNAME")
     password = os.getenv("FLUME_PASSWORD")
-    
+
     if not all([client_id, client_secret, username, password]):
         raise ValueError(
             "Missing required Flume credentials in environment variables. "
             "Please ensure FLUME_CLIENT_ID, FLUME_CLIENT_SECRET, FLUME_USERNAME, "
             "and FLUME_PASSWORD are set."
         )
-    
+
     print("\n🌊 PyFlume InfluxDB Real-Time Monitoring")
     print("=====================================")
-    
+
     async with FlumeClient(
         client_id=client_id,
         client_secret=client_secret,
@@ -85,15 +138,29 @@ async def main():
         print("\n📱 Fetching devices...")
         devices = await client.get_devices(location=True)
         print(f"Found {len(devices)} devices")
-        
-        if not client._write_api:
-            print("\n⚠️  Warning: InfluxDB is not configured. Data will only be displayed.")
+
+        if not client.influxdb_enabled:
+            print(
+                "\n⚠️  Warning: InfluxDB is not configured. Data will only be displayed."
+            )
         else:
             print("\n✅ InfluxDB is configured. Data will be stored.")
-        
-        # Create monitoring tasks for each device
-        tasks = [monitor_device(client, device) for device in devices]
-        
+
+        # Only water sensors report flow; poll them all together and feed
+        # each device's readings to its own monitor
+        water_sensors = [device for device in devices if device.type == 2]
+        # Monitors only need the latest reading, so a stalled or failed one
+        # can't make its queue grow
+        queues = {device.id: asyncio.Queue(maxsize=1) for device in water_sensors}
+        # Shared by the poller and every monitor so bursts stay within the
+        # connection pool instead of queueing inside aiohttp
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        tasks = [poll_all(client, water_sensors, queues, semaphore)]
+        tasks += [
+            monitor_device(client, device, queues[device.id], semaphore)
+            for device in water_sensors
+        ]
+
         try:
             # Run all monitoring tasks concurrently
             await asyncio.gather(*tasks)
@@ -107,4 +174,4 @@ if __name__ == "__main__":
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
-        print("\nProgram terminated by user") 
\ No newline at end of file
+        print("\nProgram terminated by user")
@@ -0,0 +1,100 @@
+"""Batched writes for Flume data."""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, List, Optional
+
+warning_logger = logging.getLogger("flume.warning")
+
+
+class BatchWriter:
+    """Coalesce individual records into batched writes.
+
+    Records added with ``put`` are buffered and handed to ``sink`` as a single
+    list once ``batch_size`` records are pending or ``flush_interval`` seconds
+    have passed, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        sink: Callable[[List[Any]], Awaitable[None]],
+        batch_size: int = 5000,
+        flush_interval: float = 3.0,
+    ) -> None:
+        """Initialize the batch writer.
+
+        Args:
+            sink: Coroutine function called with each batch of records
+            batch_size: Maximum number of records per batch
+            flush_interval: Maximum number of seconds a record stays buffered
+        """
+        self._sink = sink
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer: List[Any] = []
+        self._lock: Optional[asyncio.Lock] = None
+        self._stop: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        """Number of buffered records."""
+        return len(self._buffer)
+
+    def _start(self) -> None:
+        """Start the periodic flush task on the running event loop."""
+        self._lock = asyncio.Lock()
+        self._stop = asyncio.Event()
+        self._task = asyncio.ensure_future(self._run())
+
+    async def _run(self) -> None:
+        """Flush the buffer every ``flush_interval`` seconds until stopped."""
+        while not self._stop.is_set():
+            try:
+                await asyncio.wait_for(self._stop.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.flush()
+            except Exception as e:
+                warning_logger.error(f"Failed to flush batch: {e}")
+
+    async def put(self, record: Any) -> None:
+        """Add a record to the buffer, flushing if the batch is full.
+
+        Args:
+            record: Record to pass to the sink
+        """
+        if self._task is None:
+            self._start()
+
+        self._buffer.append(record)
+        if len(self._buffer) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Write all buffered records to the sink.
+
+        Waits for a batch already being written, so once this returns every
+        record put before the call has reached the sink.
+        """
+        if self._lock is None:
+            # Nothing was ever put
+            return
+
+        async with self._lock:
+            batch, self._buffer = self._buffer, []
+            if batch:
+                await self._sink(batch)
+
+    async def close(self) -> None:
+        """Stop the periodic flush task and write any remaining records.
+
+        The task is stopped cooperatively rather than cancelled, so a batch it
+        is writing is not lost mid-sink.
+        """
+        if self._task is not None:
+            self._stop.set()
+            await self._task
+            self._task = None
+
+        await self.flush()
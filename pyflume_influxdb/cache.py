@@ -1,10 +1,50 @@
 """Local caching for Flume data."""
+
+import asyncio
+import functools
 import os
 import json
 import sqlite3
-from datetime import datetime, timedelta
+import threading
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple, Any
+
+if TYPE_CHECKING:
+    import pandas
+
+# Shared compact encoder; json.dumps() would build a new encoder on every call
+# whenever non-default separators are passed.
+_encode = json.JSONEncoder(separators=(",", ":")).encode
+_decode = json.JSONDecoder().decode
+
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _to_epoch_us(timestamp: datetime) -> int:
+    """Convert a datetime to integer microseconds since the epoch.
+
+    Naive datetimes are interpreted as UTC, like the timestamps the client
+    writes to InfluxDB.
+    """
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return (timestamp - _EPOCH) // _MICROSECOND
+
+
+def _from_epoch_us(value: int) -> datetime:
+    """Convert integer microseconds since the epoch to a naive UTC datetime."""
+    return _EPOCH + timedelta(microseconds=value)
+
+
+def _utcnow() -> datetime:
+    """Get the current time as a naive UTC datetime."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+_RecentRows = List[Tuple[datetime, Dict[str, Any]]]
 
 
 class FlumeCache:
@@ -12,130 +52,466 @@ class FlumeCache:
 
     def __init__(self, cache_dir: Optional[str] = None):
         """Initialize the cache.
-        
+
         Args:
             cache_dir: Directory to store cache files. Defaults to ~/.pyflume_cache
         """
         if cache_dir is None:
             cache_dir = os.path.expanduser("~/.pyflume_cache")
-        
+
         self.cache_dir = Path(cache_dir)
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
-        
+        self.cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+
+        # The database holds live OAuth tokens, so only the owner may read it;
+        # SQLite gives the WAL and shared-memory files the same permissions
         self.db_path = self.cache_dir / "cache.db"
+        self.db_path.touch(mode=0o600)
+        os.chmod(self.db_path, 0o600)
+
+        # One long-lived connection shared by every method; autocommit mode so
+        # each statement is its own transaction unless one is opened explicitly.
+        self._lock = threading.Lock()
+        # get_recent() results per device, keyed by (hours, limit); a device's
+        # entries are dropped whenever new data is stored for it
+        self._recent_memo: Dict[str, Dict[Tuple[int, Optional[int]], _RecentRows]] = {}
+        self._memo_generation = 0
+        self._conn: Optional[sqlite3.Connection] = self._connect()
         self._init_db()
 
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the cache database."""
+        conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, isolation_level=None
+        )
+        # WAL with NORMAL sync only fsyncs at checkpoints instead of on every
+        # commit; the remaining settings are per connection
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-20000")
+        return conn
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return the shared connection, reopening it after close(). Must be
+        called holding the lock."""
+        if self._conn is None:
+            self._conn = self._connect()
+        return self._conn
+
     def _init_db(self) -> None:
         """Initialize the SQLite database."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Create table for flow data
+        cursor = self._conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            columns = {
+                row[1]: row[2] for row in cursor.execute("PRAGMA table_info(flow_data)")
+            }
+            if columns.get("timestamp") == "TEXT":
+                self._migrate_text_timestamps(cursor)
+
+            # Create table for flow data, timestamps stored as epoch microseconds
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS flow_data (
+                    device_id TEXT,
+                    timestamp INTEGER,
+                    data TEXT,
+                    PRIMARY KEY (device_id, timestamp)
+                )
+            """)
+
+            # The primary key already serves per-device range scans; cleanup()
+            # filters on timestamp alone and needs its own index
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_flow_data_timestamp ON flow_data (timestamp)"
+            )
+
+            # Latest OAuth token per account, so a restart can skip authenticating
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS auth_token (
+                    client_id TEXT,
+                    username TEXT,
+                    access_token TEXT,
+                    exp INTEGER,
+                    PRIMARY KEY (client_id, username)
+                )
+            """)
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+        cursor.execute("COMMIT")
+
+    @staticmethod
+    def _migrate_text_timestamps(cursor: sqlite3.Cursor) -> None:
+        """Convert a flow_data table with ISO-8601 timestamps to epoch microseconds."""
+        cursor.execute("ALTER TABLE flow_data RENAME TO flow_data_text")
+        cursor.execute("DROP INDEX IF EXISTS idx_flow_data_timestamp")
         cursor.execute("""
-            CREATE TABLE IF NOT EXISTS flow_data (
+            CREATE TABLE flow_data (
                 device_id TEXT,
-                timestamp TEXT,
+                timestamp INTEGER,
                 data TEXT,
                 PRIMARY KEY (device_id, timestamp)
             )
         """)
-        
-        conn.commit()
-        conn.close()
+        rows = cursor.execute(
+            "SELECT device_id, timestamp, data FROM flow_data_text"
+        ).fetchall()
+        cursor.executemany(
+            "INSERT OR REPLACE INTO flow_data (device_id, timestamp, data) VALUES (?, ?, ?)",
+            [
+                (device_id, _to_epoch_us(datetime.fromisoformat(timestamp)), data)
+                for device_id, timestamp, data in rows
+            ],
+        )
+        cursor.execute("DROP TABLE flow_data_text")
 
     def store(self, device_id: str, timestamp: datetime, data: Dict[str, Any]) -> None:
         """Store flow data in the cache.
-        
+
         Args:
             device_id: Device ID
             timestamp: Timestamp of the data
             data: Flow data to store
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute(
-            "INSERT OR REPLACE INTO flow_data (device_id, timestamp, data) VALUES (?, ?, ?)",
-            (device_id, timestamp.isoformat(), json.dumps(data))
-        )
-        
-        conn.commit()
-        conn.close()
+        with self._lock:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO flow_data (device_id, timestamp, data) VALUES (?, ?, ?)",
+                (device_id, _to_epoch_us(timestamp), _encode(data)),
+            )
+            self._invalidate_recent(device_id)
+
+    def store_many(self, rows: Iterable[Tuple[str, datetime, Dict[str, Any]]]) -> None:
+        """Store multiple flow data entries in a single transaction.
+
+        Args:
+            rows: Iterable of (device_id, timestamp, data) tuples
+        """
+        params = [
+            (device_id, _to_epoch_us(timestamp), _encode(data))
+            for device_id, timestamp, data in rows
+        ]
+
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO flow_data (device_id, timestamp, data) VALUES (?, ?, ?)",
+                    params,
+                )
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            for device_id, _, _ in params:
+                self._invalidate_recent(device_id)
 
     def get(self, device_id: str, timestamp: datetime) -> Optional[Dict[str, Any]]:
         """Get flow data from the cache.
-        
+
         Args:
             device_id: Device ID
             timestamp: Timestamp of the data
-            
+
         Returns:
             Flow data if found, None otherwise
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute(
-            "SELECT data FROM flow_data WHERE device_id = ? AND timestamp = ?",
-            (device_id, timestamp.isoformat())
-        )
-        
-        row = cursor.fetchone()
-        conn.close()
-        
+        with self._lock:
+            row = (
+                self._connection()
+                .execute(
+                    "SELECT data FROM flow_data WHERE device_id = ? AND timestamp = ?",
+                    (device_id, _to_epoch_us(timestamp)),
+                )
+                .fetchone()
+            )
+
         if row:
-            return json.loads(row[0])
+            return _decode(row[0])
         return None
 
-    def get_recent(self, device_id: str, hours: int = 24) -> List[Tuple[datetime, Dict[str, Any]]]:
+    def get_recent(
+        self, device_id: str, hours: int = 24, limit: Optional[int] = None
+    ) -> List[Tuple[datetime, Dict[str, Any]]]:
         """Get recent flow data for a device.
-        
+
         Args:
             device_id: Device ID
             hours: Number of hours of data to retrieve
-            
+            limit: Maximum number of entries to return (default: no limit)
+
         Returns:
             List of (timestamp, data) tuples, ordered by timestamp descending
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cutoff = (datetime.now() - timedelta(hours=hours)).isoformat()
-        
-        cursor.execute(
-            """
-            SELECT timestamp, data 
-            FROM flow_data 
-            WHERE device_id = ? AND timestamp > ?
-            ORDER BY timestamp DESC
-            """,
-            (device_id, cutoff)
+        key = (hours, limit)
+        with self._lock:
+            results = self._recent_memo.get(device_id, {}).get(key)
+            generation = self._memo_generation
+
+        if results is None:
+            results = [
+                (_from_epoch_us(timestamp), _decode(data))
+                for timestamp, data in self._fetch_recent(device_id, hours, limit)
+            ]
+            with self._lock:
+                # Skip memoizing if a write landed while the query was running
+                if generation == self._memo_generation:
+                    self._recent_memo.setdefault(device_id, {})[key] = results
+            return list(results)
+
+        # Nothing was stored since the lookup was memoized; only drop the
+        # entries that have aged out of the window since then
+        cutoff = _utcnow() - timedelta(hours=hours)
+        end = len(results)
+        while end and results[end - 1][0] <= cutoff:
+            end -= 1
+        return results[:end]
+
+    def _invalidate_recent(self, device_id: Optional[str] = None) -> None:
+        """Drop memoized get_recent() results. Must be called holding the lock.
+
+        Args:
+            device_id: Device whose results to drop; all devices if None
+        """
+        if device_id is None:
+            self._recent_memo.clear()
+        else:
+            self._recent_memo.pop(device_id, None)
+        self._memo_generation += 1
+
+    def get_recent_frame(
+        self, device_id: str, hours: int = 24, limit: Optional[int] = None
+    ) -> "pandas.DataFrame":
+        """Get recent flow data for a device as a pandas DataFrame.
+
+        Requires pandas (``pip install pyflume_influxdb[pandas]``).
+
+        Args:
+            device_id: Device ID
+            hours: Number of hours of data to retrieve
+            limit: Maximum number of entries to return (default: no limit)
+
+        Returns:
+            DataFrame with a UTC ``timestamp`` column followed by one column per
+            flow data field, ordered by timestamp descending
+        """
+        try:
+            import pandas as pd
+        except ImportError as e:
+            raise ImportError(
+                "get_recent_frame() requires pandas: pip install pyflume_influxdb[pandas]"
+            ) from e
+
+        rows = self._fetch_recent(device_id, hours, limit)
+        frame = pd.json_normalize([_decode(data) for _, data in rows])
+        frame.insert(
+            0, "timestamp", pd.to_datetime([ts for ts, _ in rows], unit="us", utc=True)
         )
-        
-        results = []
-        for row in cursor.fetchall():
-            timestamp = datetime.fromisoformat(row[0])
-            data = json.loads(row[1])
-            results.append((timestamp, data))
-        
-        conn.close()
-        return results
+        return frame
+
+    def _fetch_recent(
+        self, device_id: str, hours: int, limit: Optional[int]
+    ) -> List[Tuple[int, str]]:
+        """Fetch raw (epoch microseconds, JSON) rows for get_recent()."""
+        cutoff = _to_epoch_us(_utcnow() - timedelta(hours=hours))
+
+        with self._lock:
+            return (
+                self._connection()
+                .execute(
+                    """
+                SELECT timestamp, data 
+                FROM flow_data 
+                WHERE device_id = ? AND timestamp > ?
+                ORDER BY timestamp DESC
+                LIMIT ?
+                """,
+                    (device_id, cutoff, -1 if limit is None else limit),
+                )
+                .fetchall()
+            )
 
     def cleanup(self, max_age_hours: int = 24) -> None:
         """Remove old entries from the cache.
-        
+
         Args:
             max_age_hours: Maximum age of entries to keep in hours
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cutoff = (datetime.now() - timedelta(hours=max_age_hours)).isoformat()
-        
-        cursor.execute(
-            "DELETE FROM flow_data WHERE timestamp < ?",
-            (cutoff,)
+        cutoff = _to_epoch_us(_utcnow() - timedelta(hours=max_age_hours))
+
+        with self._lock:
+            self._connection().execute(
+                "DELETE FROM flow_data WHERE timestamp < ?", (cutoff,)
+            )
+            self._invalidate_recent()
+
+    def get_token(self, client_id: str, username: str) -> Optional[Tuple[str, int]]:
+        """Get the stored OAuth token of an account.
+
+        Args:
+            client_id: Flume API client ID
+            username: Flume account username
+
+        Returns:
+            Tuple of (access_token, exp) if stored, None otherwise
+        """
+        with self._lock:
+            row = (
+                self._connection()
+                .execute(
+                    "SELECT access_token, exp FROM auth_token WHERE client_id = ? AND username = ?",
+                    (client_id, username),
+                )
+                .fetchone()
+            )
+
+        return tuple(row) if row else None
+
+    def store_token(
+        self, client_id: str, username: str, access_token: str, exp: int
+    ) -> None:
+        """Store the OAuth token of an account, replacing any previous one.
+
+        Args:
+            client_id: Flume API client ID
+            username: Flume account username
+            access_token: JWT access token
+            exp: Expiry time of the token in seconds since the epoch
+        """
+        with self._lock:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO auth_token (client_id, username, access_token, exp) "
+                "VALUES (?, ?, ?, ?)",
+                (client_id, username, access_token, exp),
+            )
+
+    async def _run_in_thread(self, func, *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking cache method in the default executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(func, *args, **kwargs)
+        )
+
+    async def astore(
+        self, device_id: str, timestamp: datetime, data: Dict[str, Any]
+    ) -> None:
+        """Store flow data without blocking the event loop. See store()."""
+        await self._run_in_thread(self.store, device_id, timestamp, data)
+
+    async def astore_many(
+        self, rows: Iterable[Tuple[str, datetime, Dict[str, Any]]]
+    ) -> None:
+        """Store multiple entries without blocking the event loop. See store_many()."""
+        await self._run_in_thread(self.store_many, list(rows))
+
+    async def aget(
+        self, device_id: str, timestamp: datetime
+    ) -> Optional[Dict[str, Any]]:
+        """Get flow data without blocking the event loop. See get()."""
+        return await self._run_in_thread(self.get, device_id, timestamp)
+
+    async def aget_recent(
+        self, device_id: str, hours: int = 24, limit: Optional[int] = None
+    ) -> List[Tuple[datetime, Dict[str, Any]]]:
+        """Get recent flow data without blocking the event loop. See get_recent()."""
+        return await self._run_in_thread(self.get_recent, device_id, hours, limit)
+
+    async def acleanup(self, max_age_hours: int = 24) -> None:
+        """Remove old entries without blocking the event loop. See cleanup()."""
+        await self._run_in_thread(self.cleanup, max_age_hours)
+
+    async def aget_token(
+        self, client_id: str, username: str
+    ) -> Optional[Tuple[str, int]]:
+        """Get a stored OAuth token without blocking the event loop. See get_token()."""
+        return await self._run_in_thread(self.get_token, client_id, username)
+
+    async def astore_token(
+        self, client_id: str, username: str, access_token: str, exp: int
+    ) -> None:
+        """Store an OAuth token without blocking the event loop. See store_token()."""
+        await self._run_in_thread(
+            self.store_token, client_id, username, access_token, exp
         )
-        
-        conn.commit()
-        conn.close() 
\ No newline at end of file
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection.
+
+        The cache stays usable; the next call reopens the connection.
+        """
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class _NullCache:
+    """Stand-in for FlumeCache when caching is disabled.
+
+    Stores nothing and finds nothing, so callers need no ``None`` checks.
+    It is falsy, so ``if client.cache:`` still tells whether caching is on.
+    """
+
+    def __bool__(self) -> bool:
+        return False
+
+    def store(self, device_id: str, timestamp: datetime, data: Dict[str, Any]) -> None:
+        pass
+
+    def store_many(self, rows: Iterable[Tuple[str, datetime, Dict[str, Any]]]) -> None:
+        pass
+
+    def get(self, device_id: str, timestamp: datetime) -> Optional[Dict[str, Any]]:
+        return None
+
+    def get_recent(
+        self, device_id: str, hours: int = 24, limit: Optional[int] = None
+    ) -> List[Tuple[datetime, Dict[str, Any]]]:
+        return []
+
+    def cleanup(self, max_age_hours: int = 24) -> None:
+        pass
+
+    async def astore(
+        self, device_id: str, timestamp: datetime, data: Dict[str, Any]
+    ) -> None:
+        pass
+
+    async def astore_many(
+        self, rows: Iterable[Tuple[str, datetime, Dict[str, Any]]]
+    ) -> None:
+        pass
+
+    async def aget(
+        self, device_id: str, timestamp: datetime
+    ) -> Optional[Dict[str, Any]]:
+        return None
+
+    async def aget_recent(
+        self, device_id: str, hours: int = 24, limit: Optional[int] = None
+    ) -> List[Tuple[datetime, Dict[str, Any]]]:
+        return []
+
+    async def acleanup(self, max_age_hours: int = 24) -> None:
+        pass
+
+    def get_token(self, client_id: str, username: str) -> Optional[Tuple[str, int]]:
+        return None
+
+    def store_token(
+        self, client_id: str, username: str, access_token: str, exp: int
+    ) -> None:
+        pass
+
+    async def aget_token(
+        self, client_id: str, username: str
+    ) -> Optional[Tuple[str, int]]:
+        return None
+
+    async def astore_token(
+        self, client_id: str, username: str, access_token: str, exp: int
+    ) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
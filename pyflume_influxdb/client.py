@@ -5,67 +5,312 @@ The client uses two main endpoints:
 - AUTH_URL: https://api.flumetech.com/oauth/token for authentication
 """
 
+from array import array
 import asyncio
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Union, Any
+import atexit
+import base64
+from datetime import datetime
+from json import JSONEncoder, loads as json_loads
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union, Any
+import gzip
 import os
 import logging
 import logging.handlers
+import queue
+import random
+import sqlite3
 import sys
+import threading
+import time
+from urllib.parse import urlencode
 
 import aiohttp
-from influxdb_client import InfluxDBClient, Point
-from influxdb_client.client.write_api import SYNCHRONOUS
+from pydantic import TypeAdapter
 
 from .exceptions import FlumeAuthError, FlumeAPIError, FlumeInfluxDBError
-from .models import (Device, FlumeResponse, Location, UsageAlert, UsageAlertRule,
-                    WaterUsageQuery, WaterUsageReading)
-from .cache import FlumeCache
+from .models import (
+    Device,
+    FlumeResponse,
+    Location,
+    UsageAlert,
+    UsageAlertRule,
+    WaterUsageQuery,
+    WaterUsageReading,
+)
+from .cache import FlumeCache, _NullCache
+from .batch import BatchWriter
+from .throttle import AdaptiveLimiter, SlidingWindowLimiter
+
 
 # Set up logging
+def _queue_logger(name: str, level: int, *handlers: logging.Handler) -> None:
+    """Attach handlers to a logger through a queue drained on a background thread.
+
+    File writes happen on the listener thread, so logging from async code never
+    blocks the event loop on disk I/O.
+    """
+    log_queue = queue.SimpleQueue()
+    logger = logging.getLogger(name)
+    logger.setLevel(level)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    listener.start()
+    # Stopping the listener writes out any records still in the queue
+    atexit.register(listener.stop)
+
+
+_logging_lock = threading.Lock()
+_logging_configured = False
+
+
 def setup_logging():
+    """Write the flume loggers to files under logs/ and main output to stdout.
+
+    Called by the first FlumeClient unless it is created with
+    ``configure_logging=False``; later calls do nothing.
+    """
+    global _logging_configured
+    with _logging_lock:
+        if _logging_configured:
+            return
+        _logging_configured = True
+
     # Create logs directory if it doesn't exist
-    os.makedirs('logs', exist_ok=True)
-    
+    os.makedirs("logs", exist_ok=True)
+    formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+
     # Configure main logger
-    main_logger = logging.getLogger('flume.main')
-    main_logger.setLevel(logging.INFO)
-    main_handler = logging.FileHandler('logs/main.log')
-    main_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-    main_logger.addHandler(main_handler)
-    
+    main_handler = logging.FileHandler("logs/main.log")
+    main_handler.setFormatter(formatter)
+
     # Add stdout handler to main logger
     stdout_handler = logging.StreamHandler(sys.stdout)
-    stdout_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-    main_logger.addHandler(stdout_handler)
-    
+    stdout_handler.setFormatter(formatter)
+    _queue_logger("flume.main", logging.INFO, main_handler, stdout_handler)
+
     # Configure debug logger
-    debug_logger = logging.getLogger('flume.debug')
-    debug_logger.setLevel(logging.DEBUG)
-    debug_handler = logging.FileHandler('logs/debug.log')
-    debug_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-    debug_logger.addHandler(debug_handler)
-    
+    debug_handler = logging.FileHandler("logs/debug.log")
+    debug_handler.setFormatter(formatter)
+    _queue_logger("flume.debug", logging.DEBUG, debug_handler)
+
     # Configure warning logger
-    warning_logger = logging.getLogger('flume.warning')
-    warning_logger.setLevel(logging.WARNING)
-    warning_handler = logging.FileHandler('logs/warning.log')
-    warning_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-    warning_logger.addHandler(warning_handler)
+    warning_handler = logging.FileHandler("logs/warning.log")
+    warning_handler.setFormatter(formatter)
+    _queue_logger("flume.warning", logging.WARNING, warning_handler)
 
-setup_logging()
+
+# Stay silent until the application or the first client configures handlers
+logging.getLogger("flume").addHandler(logging.NullHandler())
 
 # Get logger instances
-main_logger = logging.getLogger('flume.main')
-debug_logger = logging.getLogger('flume.debug')
-warning_logger = logging.getLogger('flume.warning')
+main_logger = logging.getLogger("flume.main")
+debug_logger = logging.getLogger("flume.debug")
+warning_logger = logging.getLogger("flume.warning")
+
+# Request bodies are only read by the API, so drop the optional whitespace
+_json_dumps = JSONEncoder(separators=(",", ":")).encode
+_JSON_CONTENT_TYPE = MappingProxyType({"Content-Type": "application/json"})
+
+_EPOCH_ORDINAL = datetime(1970, 1, 1).toordinal()
+
+_ESCAPE_MEASUREMENT = str.maketrans({",": r"\,", " ": r"\ "})
+_ESCAPE_TAG = str.maketrans({",": r"\,", "=": r"\=", " ": r"\ "})
+
+
+def _to_nanoseconds(timestamp: datetime) -> int:
+    """Convert a datetime to nanoseconds since the epoch, naive meaning UTC."""
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.replace(tzinfo=None) - timestamp.utcoffset()
+    # Integer field arithmetic is exact and avoids the timedelta objects
+    # that subtracting an aware epoch datetime would allocate
+    seconds = (
+        (timestamp.toordinal() - _EPOCH_ORDINAL) * 86400
+        + timestamp.hour * 3600
+        + timestamp.minute * 60
+        + timestamp.second
+    )
+    return seconds * 1_000_000_000 + timestamp.microsecond * 1000
+
+
+# Validate whole response lists in a single pydantic-core call instead of
+# constructing each model from Python
+_DEVICES = TypeAdapter(List[Device])
+_LOCATIONS = TypeAdapter(List[Location])
+_USAGE_ALERTS = TypeAdapter(List[UsageAlert])
+_ALERT_RULES = TypeAdapter(List[UsageAlertRule])
+_QUERY_READINGS = TypeAdapter(List[List[WaterUsageReading]])
+
+# yarl rejects bool query values, so flags are encoded when params are built
+_BOOL_STR = {True: "true", False: "false"}
+
+_LIST_PARAM_KEYS = ("limit", "offset", "sort_field", "sort_direction")
+_DEFAULT_LIST_PARAMS = MappingProxyType(
+    {"limit": 50, "offset": 0, "sort_field": "id", "sort_direction": "ASC"}
+)
+_DEFAULT_ALERT_PARAMS = MappingProxyType(
+    {**_DEFAULT_LIST_PARAMS, "sort_field": "triggered_datetime"}
+)
+
+
+def _list_params(
+    kwargs: Dict[str, Any],
+    defaults: Mapping[str, Any] = _DEFAULT_LIST_PARAMS,
+    **extra: Any,
+) -> Dict[str, Any]:
+    """Build the pagination and sort parameters of a list endpoint.
+
+    Args:
+        kwargs: Keyword arguments passed to the endpoint method
+        defaults: Default pagination and sort parameters
+        **extra: Additional endpoint-specific parameters
+    """
+    params = dict(defaults)
+    for key in _LIST_PARAM_KEYS:
+        if key in kwargs:
+            params[key] = kwargs[key]
+    params.update(extra)
+    return params
+
+
+def _device_list_params(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the query parameters of the device list endpoint."""
+    return _list_params(
+        kwargs,
+        location=_BOOL_STR[bool(kwargs.get("include_location", False))],
+        user=_BOOL_STR[bool(kwargs.get("include_user", False))],
+        list_shared=_BOOL_STR[bool(kwargs.get("list_shared", False))],
+    )
+
+
+def _location_list_params(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the query parameters of the location list endpoint."""
+    return _list_params(
+        kwargs, list_shared=_BOOL_STR[bool(kwargs.get("list_shared", False))]
+    )
+
+
+def _alert_list_params(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the query parameters of the usage alert list endpoint."""
+    params = _list_params(kwargs, _DEFAULT_ALERT_PARAMS)
+    if "device_id" in kwargs:
+        params["device_id"] = kwargs["device_id"]
+    return params
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds, ignoring other forms."""
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        return None
+
+
+async def _sleep_unless_set(delay: float, event: Optional[asyncio.Event]) -> bool:
+    """Sleep for ``delay`` seconds, waking early once ``event`` is set.
+
+    Returns:
+        Whether the event is set
+    """
+    if event is None:
+        await asyncio.sleep(delay)
+        return False
+    try:
+        await asyncio.wait_for(event.wait(), delay)
+    except asyncio.TimeoutError:
+        pass
+    return event.is_set()
+
+
+def _datetimes_to_nanoseconds(datetimes: Iterable[str]) -> List[int]:
+    """Convert ISO 8601 timestamps to nanoseconds since the epoch, naive meaning UTC.
+
+    Usage readings come in runs that share a date, so each date is parsed
+    once and plain ``HH:MM:SS`` times of day are added arithmetically. Any
+    other form falls back to datetime.fromisoformat.
+    """
+    day_ns: Dict[str, int] = {}
+    result = []
+    for value in datetimes:
+        if len(value) == 19 and value[13] == ":" and value[16] == ":":
+            date = value[:10]
+            base = day_ns.get(date)
+            if base is None:
+                base = day_ns[date] = _to_nanoseconds(datetime.fromisoformat(date))
+            seconds = (
+                int(value[11:13]) * 3600 + int(value[14:16]) * 60 + int(value[17:19])
+            )
+            result.append(base + seconds * 1_000_000_000)
+        else:
+            result.append(_to_nanoseconds(datetime.fromisoformat(value)))
+    return result
+
+
+def _line_prefix(measurement: str) -> str:
+    """Build the escaped line protocol prefix shared by a measurement's records."""
+    return f"{measurement.translate(_ESCAPE_MEASUREMENT)},device_id="
+
+
+def _to_line_protocol(
+    prefix: str, device_id: str, flow_rate: float, active: bool, timestamp_ns: int
+) -> str:
+    """Encode a flow reading as an InfluxDB line protocol record.
+
+    Args:
+        prefix: Measurement prefix from _line_prefix()
+        device_id: Device ID tag value
+        flow_rate: Flow rate in gallons per minute
+        active: Whether water is flowing
+        timestamp_ns: Time of the reading in nanoseconds since the epoch
+    """
+    return (
+        f"{prefix}{device_id.translate(_ESCAPE_TAG)} "
+        f"active={'true' if active else 'false'},flow_rate={flow_rate!r} {timestamp_ns}"
+    )
+
+
+def _to_usage_line_protocol(
+    prefix: str, device_id: str, value: float, timestamp_ns: int
+) -> str:
+    """Encode a water usage reading as an InfluxDB line protocol record.
+
+    Args:
+        prefix: Measurement prefix from _line_prefix()
+        device_id: Device ID tag value
+        value: Water used during the reading's bucket
+        timestamp_ns: Start time of the reading's bucket in nanoseconds
+    """
+    return f"{prefix}{device_id.translate(_ESCAPE_TAG)} usage={float(value)!r} {timestamp_ns}"
+
 
 class FlumeClient:
     """Client for interacting with the Flume API."""
 
     BASE_URL = "https://api.flumetech.com"
     AUTH_URL = "https://api.flumetech.com/oauth/token"
-    
+
+    # Connection pool settings for the shared HTTP session
+    CONNECTION_LIMIT = 64
+    CONNECTION_LIMIT_PER_HOST = 16
+    KEEPALIVE_TIMEOUT = 75
+    REQUEST_TIMEOUT = 30
+    CONNECT_TIMEOUT = 5
+
+    # Retry transient failures with exponential backoff plus random jitter
+    MAX_RETRIES = 3
+    RETRY_BASE_DELAY = 0.5
+    RETRY_MAX_DELAY = 10.0
+    RETRY_JITTER = 0.5
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+    # Refresh the access token in the background this many seconds before it expires
+    TOKEN_REFRESH_MARGIN = 180
+
     def __init__(
         self,
         client_id: str,
@@ -78,9 +323,17 @@ class FlumeClient:
         influxdb_bucket: Optional[str] = None,
         influxdb_measurement: str = "water_usage",
         cache_dir: Optional[str] = None,
+        skip_unchanged: bool = False,
+        batch_size: int = 5000,
+        flush_interval: float = 3.0,
+        max_concurrency: int = 32,
+        connection_limit: Optional[int] = None,
+        keepalive_timeout: Optional[float] = None,
+        requests_per_minute: Optional[int] = None,
+        configure_logging: bool = True,
     ) -> None:
         """Initialize the Flume client.
-        
+
         Args:
             client_id: Flume API client ID
             client_secret: Flume API client secret
@@ -92,17 +345,74 @@ class FlumeClient:
             influxdb_bucket: InfluxDB bucket name
             influxdb_measurement: InfluxDB measurement name
             cache_dir: Directory for local cache (optional)
+            skip_unchanged: Skip writing readings whose flow rate and active
+                state match the previous reading for the device
+            batch_size: Number of buffered readings that triggers a write
+            flush_interval: Maximum number of seconds a reading stays buffered
+                before it is written
+            max_concurrency: Upper bound for the adaptive number of concurrent
+                API requests, capped at the per-host connection limit
+            connection_limit: Maximum number of pooled HTTP connections
+                (default: CONNECTION_LIMIT)
+            keepalive_timeout: Seconds an idle pooled connection is kept open
+                (default: KEEPALIVE_TIMEOUT)
+            requests_per_minute: Maximum number of API requests started per
+                minute (optional)
+            configure_logging: Set up the package's file and stdout log
+                handlers; pass False to configure the flume loggers yourself
         """
+        if configure_logging:
+            setup_logging()
+
         self.client_id = client_id
         self.client_secret = client_secret
         self.username = username
         self.password = password
+        # Credentials never change, so the auth payload and request headers are
+        # built once; only the Authorization header is updated on re-auth
+        self._auth_body = {
+            "grant_type": "password",
+            "client_id": client_id,
+            "client_secret": client_secret,
+            "username": username,
+            "password": password,
+        }
+        self._auth_payload = _json_dumps(self._auth_body).encode()
+        self._default_headers = {
+            "Authorization": "Bearer None",
+            "Content-Type": "application/json",
+        }
+        self.connection_limit = connection_limit or self.CONNECTION_LIMIT
+        self.keepalive_timeout = (
+            self.KEEPALIVE_TIMEOUT if keepalive_timeout is None else keepalive_timeout
+        )
         self._session: Optional[aiohttp.ClientSession] = None
         self._access_token: Optional[str] = None
+        self._token_exp: Optional[float] = None
         self._user_id: Optional[int] = None
-        self._influxdb_client: Optional[InfluxDBClient] = None
-        self._write_api = None
-        self.cache = FlumeCache(cache_dir) if cache_dir else None
+        self._refresh_lock: Optional[asyncio.Lock] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._influxdb_write_url: Optional[str] = None
+        self._influxdb_ping_url: Optional[str] = None
+        self._influxdb_headers: Optional[Mapping[str, str]] = None
+        self._batch_writer: Optional[BatchWriter] = None
+        self.cache: Union[FlumeCache, _NullCache] = (
+            FlumeCache(cache_dir) if cache_dir else _NullCache()
+        )
+        self.skip_unchanged = skip_unchanged
+        self._last_samples: Dict[str, Tuple[Any, Any]] = {}
+        # Requests beyond the per-host pool size would only queue inside the
+        # connector, so cap the adaptive concurrency there
+        self.connection_limit_per_host = min(
+            self.CONNECTION_LIMIT_PER_HOST, self.connection_limit
+        )
+        max_concurrency = min(max_concurrency, self.connection_limit_per_host)
+        self._limiter = AdaptiveLimiter(
+            initial=min(8, max_concurrency), maximum=max_concurrency
+        )
+        self._rate_window = (
+            SlidingWindowLimiter(requests_per_minute) if requests_per_minute else None
+        )
 
         # InfluxDB configuration
         self.influxdb_url = influxdb_url
@@ -110,178 +420,398 @@ class FlumeClient:
         self.influxdb_org = influxdb_org
         self.influxdb_bucket = influxdb_bucket
         self.influxdb_measurement = influxdb_measurement
+        self._line_prefixes: Dict[str, str] = {}
 
-        # Initialize InfluxDB client if all required parameters are provided
+        # Enable InfluxDB writes if all required parameters are provided. Line
+        # protocol is POSTed to the v2 write endpoint over the same session
+        # and connection pool as the Flume API.
         if all([influxdb_url, influxdb_token, influxdb_org, influxdb_bucket]):
-            self._influxdb_client = InfluxDBClient(
-                url=influxdb_url,
-                token=influxdb_token,
-                org=influxdb_org
+            base_url = influxdb_url.rstrip("/")
+            self._influxdb_write_url = f"{base_url}/api/v2/write?" + urlencode(
+                {
+                    "bucket": influxdb_bucket,
+                    "org": influxdb_org,
+                    "precision": "ns",
+                }
+            )
+            self._influxdb_ping_url = f"{base_url}/ping"
+            self._influxdb_headers = MappingProxyType(
+                {
+                    "Authorization": f"Token {influxdb_token}",
+                    "Content-Type": "text/plain; charset=utf-8",
+                    "Content-Encoding": "gzip",
+                }
             )
-            self._write_api = self._influxdb_client.write_api(write_options=SYNCHRONOUS)
-    
+            self._batch_writer = BatchWriter(
+                self._write_batch, batch_size=batch_size, flush_interval=flush_interval
+            )
+
     @property
     def user_id(self) -> Optional[int]:
         """Get the authenticated user ID."""
         return self._user_id
-    
+
+    @property
+    def influxdb_enabled(self) -> bool:
+        """Whether InfluxDB is configured for writing readings."""
+        return self._influxdb_write_url is not None
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        """Create the HTTP session shared by all requests of this client."""
+        connector = aiohttp.TCPConnector(
+            limit=self.connection_limit,
+            limit_per_host=self.connection_limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=300,
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            json_serialize=_json_dumps,
+            timeout=aiohttp.ClientTimeout(
+                total=self.REQUEST_TIMEOUT, connect=self.CONNECT_TIMEOUT
+            ),
+        )
+
     async def __aenter__(self):
         """Set up the client session."""
-        self._session = aiohttp.ClientSession()
-        await self.authenticate()
+        if not self._session:
+            self._session = self._create_session()
+        # Authenticating opens the pooled connection to the Flume API; open the
+        # InfluxDB one at the same time so neither first request pays for it
+        warm_up = asyncio.ensure_future(self._warm_up_influxdb())
+        try:
+            await asyncio.gather(self.connect(), warm_up)
+        except BaseException:
+            # __aexit__ won't run, so don't leave the session or warm-up behind
+            warm_up.cancel()
+            await asyncio.gather(warm_up, return_exceptions=True)
+            await self.close()
+            raise
         return self
-    
+
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Clean up the client session."""
-        if self._session:
-            await self._session.close()
-        if self._influxdb_client:
-            self._influxdb_client.close()
-    
+        await self.close()
+
+    async def _warm_up_influxdb(self) -> None:
+        """Open the InfluxDB connection ahead of the first write."""
+        if not self._influxdb_ping_url:
+            return
+
+        try:
+            async with self._session.get(self._influxdb_ping_url) as response:
+                await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            debug_logger.debug("InfluxDB warm-up failed: %s", e)
+
     async def connect(self) -> None:
-        """Connect to the Flume API and authenticate."""
-        await self.authenticate()
-    
+        """Connect to the Flume API and authenticate.
+
+        The token this client already holds, e.g. when it is re-entered, is
+        kept until it expires, and a token cached by an earlier run is reused
+        while it is still fresh. Call authenticate() to force a new token.
+        """
+        if not self._session:
+            self._session = self._create_session()
+
+        if self._access_token and not self._token_is_expired():
+            return
+        if not await self._restore_token():
+            await self.authenticate()
+
+    async def _restore_token(self) -> bool:
+        """Adopt the access token stored in the cache if it is still fresh.
+
+        Returns:
+            Whether a cached token was adopted
+        """
+        try:
+            stored = await self.cache.aget_token(self.client_id, self.username)
+        except (sqlite3.Error, OSError) as e:
+            warning_logger.error(f"Failed to read cached access token: {e}")
+            return False
+
+        if stored is None:
+            return False
+        access_token, exp = stored
+        if exp - self.TOKEN_REFRESH_MARGIN <= time.time():
+            return False
+
+        try:
+            self._use_token(access_token)
+        except (FlumeAuthError, ValueError):
+            return False
+        debug_logger.debug("Using cached access token")
+        return True
+
     async def authenticate(self) -> None:
         """Authenticate with the Flume API."""
         if not self._session:
-            self._session = aiohttp.ClientSession()
-
-        auth_data = {
-            "grant_type": "password",
-            "client_id": self.client_id,
-            "client_secret": self.client_secret,
-            "username": self.username,
-            "password": self.password
-        }
+            self._session = self._create_session()
 
-        debug_logger.debug("=== AUTH REQUEST ===")
-        debug_logger.debug(f"URL: {self.AUTH_URL}")
-        debug_logger.debug(f"Data: {auth_data}")
+        if debug_logger.isEnabledFor(logging.DEBUG):
+            debug_logger.debug("=== AUTH REQUEST ===")
+            debug_logger.debug("URL: %s", self.AUTH_URL)
+            debug_logger.debug("Data: %s", self._auth_body)
 
-        async with self._session.post(self.AUTH_URL, json=auth_data) as response:
-            debug_logger.debug("=== AUTH RESPONSE ===")
-            debug_logger.debug(f"Status: {response.status}")
-            debug_logger.debug(f"Headers: {response.headers}")
-            response_text = await response.text()
-            debug_logger.debug(f"Body: {response_text}")
+        async with self._session.post(
+            self.AUTH_URL, data=self._auth_payload, headers=_JSON_CONTENT_TYPE
+        ) as response:
+            body = await response.read()
+            if debug_logger.isEnabledFor(logging.DEBUG):
+                debug_logger.debug("=== AUTH RESPONSE ===")
+                debug_logger.debug("Status: %s", response.status)
+                debug_logger.debug("Headers: %s", response.headers)
+                debug_logger.debug("Body: %s", body.decode("utf-8", "replace"))
 
             if response.status != 200:
                 warning_logger.error("Failed to authenticate with Flume API")
                 raise FlumeAuthError("Failed to authenticate with Flume API")
-            
+
             try:
-                data = await response.json()
-                debug_logger.debug(f"Parsed JSON: {data}")
+                data = json_loads(body)
+                debug_logger.debug("Parsed JSON: %s", data)
                 auth_data = data.get("data", [{}])[0]
-                self._access_token = auth_data.get("access_token")
-                
-                if not self._access_token:
+                access_token = auth_data.get("access_token")
+
+                if not access_token:
                     warning_logger.error("Missing access token in auth response")
                     raise FlumeAuthError("Missing access token in auth response")
-                
-                # Decode the JWT token to get the user ID
-                token_parts = self._access_token.split('.')
-                if len(token_parts) != 3:
-                    warning_logger.error("Invalid JWT token format")
-                    raise FlumeAuthError("Invalid JWT token format")
-                
-                import base64
-                import json
-                
-                # Add padding if needed
-                padding = '=' * (4 - len(token_parts[1]) % 4)
-                payload = base64.b64decode(token_parts[1] + padding).decode('utf-8')
-                token_data = json.loads(payload)
-                
-                self._user_id = token_data.get('user_id')
-                if not self._user_id:
-                    warning_logger.error("Missing user ID in JWT token")
-                    raise FlumeAuthError("Missing user ID in JWT token")
-                
-                debug_logger.debug(f"Decoded JWT payload: {token_data}")
-                debug_logger.debug(f"User ID: {self._user_id}")
-                
+                self._use_token(access_token)
+
             except Exception as e:
                 warning_logger.error(f"Error parsing auth response: {e}")
                 raise FlumeAuthError(f"Failed to parse auth response: {e}")
-    
+
+        if self._token_exp is not None:
+            try:
+                await self.cache.astore_token(
+                    self.client_id,
+                    self.username,
+                    self._access_token,
+                    int(self._token_exp),
+                )
+            except (sqlite3.Error, OSError) as e:
+                warning_logger.error(f"Failed to cache access token: {e}")
+
+    def _use_token(self, access_token: str) -> None:
+        """Use an access token, reading its expiry and user ID from the JWT."""
+        token_parts = access_token.split(".")
+        if len(token_parts) != 3:
+            warning_logger.error("Invalid JWT token format")
+            raise FlumeAuthError("Invalid JWT token format")
+
+        # JWT segments are unpadded URL-safe base64
+        segment = token_parts[1].encode("ascii")
+        payload = base64.urlsafe_b64decode(segment + b"=" * (-len(segment) % 4))
+        token_data = json_loads(payload)
+
+        user_id = token_data.get("user_id")
+        if not user_id:
+            warning_logger.error("Missing user ID in JWT token")
+            raise FlumeAuthError("Missing user ID in JWT token")
+
+        self._access_token = access_token
+        self._default_headers["Authorization"] = f"Bearer {access_token}"
+        self._token_exp = token_data.get("exp")
+        self._user_id = user_id
+
+        if debug_logger.isEnabledFor(logging.DEBUG):
+            debug_logger.debug("Decoded JWT payload: %s", token_data)
+            debug_logger.debug("User ID: %s", self._user_id)
+
+    def _token_is_expired(self) -> bool:
+        """Whether the access token is past its expiry time."""
+        return self._token_exp is not None and time.time() >= self._token_exp
+
+    def _token_is_stale(self) -> bool:
+        """Whether the access token is within TOKEN_REFRESH_MARGIN of expiring."""
+        return (
+            self._token_exp is not None
+            and time.time() >= self._token_exp - self.TOKEN_REFRESH_MARGIN
+        )
+
+    async def _refresh_token(self) -> None:
+        """Re-authenticate unless another caller already refreshed the token."""
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+
+        async with self._refresh_lock:
+            if self._access_token and not self._token_is_stale():
+                return
+            await self.authenticate()
+
+    async def _reauthenticate(self, rejected_token: Optional[str]) -> None:
+        """Replace a token the API rejected, once for all concurrent callers.
+
+        Args:
+            rejected_token: Token that was sent with the rejected request
+        """
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+
+        async with self._refresh_lock:
+            if self._access_token != rejected_token:
+                # Another request already re-authenticated; reuse its token
+                return
+            main_logger.info("Access token expired, re-authenticating...")
+            await self.authenticate()
+
+    async def _refresh_token_in_background(self) -> None:
+        """Refresh a stale token, logging failures instead of raising them."""
+        try:
+            await self._refresh_token()
+        except (FlumeAuthError, aiohttp.ClientError) as e:
+            warning_logger.error(f"Background token refresh failed: {e}")
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        json: Optional[Dict[str, Any]],
+        data: Optional[bytes] = None,
+    ) -> Tuple[int, Any, bytes]:
+        """Send a single request, throttled by the client's limiters.
+
+        Returns:
+            Tuple of (status, headers, raw body)
+        """
+        if self._rate_window is not None:
+            await self._rate_window.wait_if_throttled()
+
+        async with self._limiter:
+            async with self._session.request(
+                method,
+                url,
+                headers=self._default_headers,
+                params=params,
+                json=json,
+                data=data,
+            ) as response:
+                body = await response.read()
+
+        # Back off when the API pushes back, probe upwards again otherwise
+        if response.status == 429 or response.status >= 500:
+            self._limiter.on_overload()
+        elif response.status < 400:
+            self._limiter.on_success()
+        return response.status, response.headers, body
+
+    def _retry_delay(self, attempt: int) -> float:
+        """Exponential backoff with jitter before retry number ``attempt + 1``."""
+        delay = min(self.RETRY_MAX_DELAY, self.RETRY_BASE_DELAY * 2**attempt)
+        return delay + random.uniform(0, self.RETRY_JITTER)
+
     async def _request(
         self,
         method: str,
         endpoint: str,
         params: Optional[Dict[str, Any]] = None,
         json: Optional[Dict[str, Any]] = None,
+        data: Optional[bytes] = None,
     ) -> Dict[str, Any]:
-        """Make a request to the Flume API."""
+        """Make a request to the Flume API.
+
+        Args:
+            method: HTTP method
+            endpoint: Path relative to BASE_URL
+            params: Query parameters
+            json: Body to serialize as JSON
+            data: Body already serialized as JSON
+        """
         if not self._session:
             raise FlumeAuthError("Client not connected. Call connect() first.")
 
-        if not self._access_token:
-            await self.authenticate()
+        if not self._access_token or self._token_is_expired():
+            await self._refresh_token()
+        elif self._token_is_stale():
+            # The current token is still valid; keep using it while a single
+            # refresh runs in the background
+            if self._refresh_task is None or self._refresh_task.done():
+                self._refresh_task = asyncio.ensure_future(
+                    self._refresh_token_in_background()
+                )
 
-        # Convert boolean values to strings in params
-        if params:
-            params = {k: str(v).lower() if isinstance(v, bool) else v for k, v in params.items()}
+        url = f"{self.BASE_URL}{endpoint}"
+        if debug_logger.isEnabledFor(logging.DEBUG):
+            debug_logger.debug("=== REQUEST DETAILS ===")
+            debug_logger.debug("URL: %s", url)
+            debug_logger.debug("Method: %s", method)
+            debug_logger.debug("Headers: %s", self._default_headers)
+            debug_logger.debug("Params: %s", params)
+            debug_logger.debug("Body: %s", json if data is None else data.decode())
 
-        headers = {
-            "Authorization": f"Bearer {self._access_token}",
-            "Content-Type": "application/json"
-        }
+        reauthenticated = False
+        for attempt in range(self.MAX_RETRIES + 1):
+            last_attempt = attempt == self.MAX_RETRIES
+            retry_after = None
+            token = self._access_token
+            try:
+                status, response_headers, body = await self._send(
+                    method, url, params, json, data
+                )
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if last_attempt:
+                    warning_logger.error(f"Request failed: {str(e)}")
+                    raise FlumeAPIError(f"Request failed: {str(e)}")
+                warning_logger.warning(f"Request failed, retrying: {str(e)}")
+            except aiohttp.ClientError as e:
+                warning_logger.error(f"Request failed: {str(e)}")
+                raise FlumeAPIError(f"Request failed: {str(e)}")
+            else:
+                if debug_logger.isEnabledFor(logging.DEBUG):
+                    debug_logger.debug("=== RESPONSE DETAILS ===")
+                    debug_logger.debug("Status: %s", status)
+                    debug_logger.debug("Headers: %s", response_headers)
+                    debug_logger.debug("Body: %s", body.decode("utf-8", "replace"))
 
-        url = f"{self.BASE_URL}{endpoint}"
-        debug_logger.debug("=== REQUEST DETAILS ===")
-        debug_logger.debug(f"URL: {url}")
-        debug_logger.debug(f"Method: {method}")
-        debug_logger.debug(f"Headers: {headers}")
-        debug_logger.debug(f"Params: {params}")
-        debug_logger.debug(f"Body: {json}")
+                if status == 200:
+                    try:
+                        # json.loads detects the encoding of raw bytes itself,
+                        # skipping aiohttp's charset detection and str decode
+                        return json_loads(body)
+                    except ValueError as e:
+                        warning_logger.error(f"Invalid JSON response: {str(e)}")
+                        raise FlumeAPIError(f"Invalid JSON response: {str(e)}")
+
+                if status == 401:
+                    # A fresh token being rejected as well means retrying
+                    # cannot help, e.g. revoked credentials or clock skew
+                    if reauthenticated:
+                        warning_logger.error(
+                            "API request rejected after re-authenticating"
+                        )
+                        raise FlumeAuthError(
+                            "API request rejected after re-authenticating"
+                        )
+                    if last_attempt:
+                        warning_logger.error(
+                            "API request rejected with no retries left"
+                        )
+                        raise FlumeAuthError(
+                            "API request rejected with no retries left"
+                        )
+                    await self._reauthenticate(token)
+                    reauthenticated = True
+                    continue
+
+                if last_attempt or status not in self.RETRY_STATUSES:
+                    warning_logger.error(f"API request failed: {status}")
+                    raise FlumeAPIError(
+                        f"API request failed: {status}\nResponse: {body.decode('utf-8', 'replace')}"
+                    )
+
+                warning_logger.warning(f"API request failed with {status}, retrying")
+                retry_after = _parse_retry_after(response_headers.get("Retry-After"))
+
+            if retry_after is None:
+                retry_after = self._retry_delay(attempt)
+            await asyncio.sleep(retry_after)
 
-        try:
-            async with self._session.request(
-                method,
-                url,
-                headers=headers,
-                params=params,
-                json=json
-            ) as response:
-                debug_logger.debug("=== RESPONSE DETAILS ===")
-                debug_logger.debug(f"Status: {response.status}")
-                debug_logger.debug(f"Headers: {response.headers}")
-                
-                response_text = await response.text()
-                debug_logger.debug(f"Body: {response_text}")
-
-                if response.status == 401:
-                    main_logger.info("Access token expired, re-authenticating...")
-                    await self.authenticate()
-                    headers["Authorization"] = f"Bearer {self._access_token}"
-                    async with self._session.request(
-                        method,
-                        url,
-                        headers=headers,
-                        params=params,
-                        json=json
-                    ) as retry_response:
-                        retry_response_text = await retry_response.text()
-                        if retry_response.status != 200:
-                            warning_logger.error(f"API request failed after re-auth: {retry_response.status}")
-                            raise FlumeAPIError(f"API request failed: {retry_response.status}\nResponse: {retry_response_text}")
-                        return await retry_response.json()
-
-                if response.status != 200:
-                    warning_logger.error(f"API request failed: {response.status}")
-                    raise FlumeAPIError(f"API request failed: {response.status}\nResponse: {response_text}")
-
-                return await response.json()
-
-        except aiohttp.ClientError as e:
-            warning_logger.error(f"Request failed: {str(e)}")
-            raise FlumeAPIError(f"Request failed: {str(e)}")
-    
     async def get_devices(self, **kwargs) -> List[Device]:
         """Get all devices associated with the user.
-        
+
         Args:
             include_location: Whether to include location data (default: False)
             include_user: Whether to include user data (default: False)
@@ -290,50 +820,69 @@ class FlumeClient:
             sort_field: Field to sort by (default: "id")
             sort_direction: Sort direction (default: "ASC")
             list_shared: Whether to include shared devices (default: False)
-            
+
         Returns:
             List of Device objects
         """
-        params = {
-            "limit": kwargs.get("limit", 50),
-            "offset": kwargs.get("offset", 0),
-            "sort_field": kwargs.get("sort_field", "id"),
-            "sort_direction": kwargs.get("sort_direction", "ASC"),
-            "location": kwargs.get("include_location", False),
-            "user": kwargs.get("include_user", False),
-            "list_shared": kwargs.get("list_shared", False),
-        }
-        response = await self._request("GET", "/me/devices", params=params)
-        return [Device(**device) for device in response["data"]]
-    
+        response = await self._request(
+            "GET", "/me/devices", params=_device_list_params(kwargs)
+        )
+        return _DEVICES.validate_python(response["data"])
+
+    async def get_all_devices(self, page_size: int = 50, **kwargs) -> List[Device]:
+        """Get every device associated with the user, fetching pages concurrently.
+
+        Args:
+            page_size: Number of devices per request
+            **kwargs: Filter and sort options of get_devices
+
+        Returns:
+            List of Device objects
+        """
+        data = await self._get_all_pages(
+            "/me/devices", _device_list_params(kwargs), page_size
+        )
+        return _DEVICES.validate_python(data)
+
     async def get_device(self, device_id: str, **kwargs) -> Device:
         """Get a specific device by ID."""
         params = {
-            "user": kwargs.get("include_user", False),
-            "location": kwargs.get("include_location", False),
+            "user": _BOOL_STR[bool(kwargs.get("include_user", False))],
+            "location": _BOOL_STR[bool(kwargs.get("include_location", False))],
         }
         response = await self._request(
             "GET", f"/users/{self.user_id}/devices/{device_id}", params=params
         )
-        return Device(**response["data"][0])
-    
+        return Device.model_validate(response["data"][0])
+
     async def get_locations(self, **kwargs) -> List[Location]:
         """Get all locations associated with the user."""
-        params = {
-            "limit": kwargs.get("limit", 50),
-            "offset": kwargs.get("offset", 0),
-            "sort_field": kwargs.get("sort_field", "id"),
-            "sort_direction": kwargs.get("sort_direction", "ASC"),
-            "list_shared": kwargs.get("list_shared", False),
-        }
-        response = await self._request("GET", f"/users/{self.user_id}/locations", params=params)
-        return [Location(**location) for location in response["data"]]
-    
+        response = await self._request(
+            "GET",
+            f"/users/{self.user_id}/locations",
+            params=_location_list_params(kwargs),
+        )
+        return _LOCATIONS.validate_python(response["data"])
+
+    async def get_all_locations(self, page_size: int = 50, **kwargs) -> List[Location]:
+        """Get every location associated with the user, fetching pages concurrently.
+
+        Args:
+            page_size: Number of locations per request
+            **kwargs: Filter and sort options of get_locations
+        """
+        data = await self._get_all_pages(
+            f"/users/{self.user_id}/locations", _location_list_params(kwargs), page_size
+        )
+        return _LOCATIONS.validate_python(data)
+
     async def get_location(self, location_id: int) -> Location:
         """Get a specific location by ID."""
-        response = await self._request("GET", f"/users/{self.user_id}/locations/{location_id}")
-        return Location(**response["data"][0])
-    
+        response = await self._request(
+            "GET", f"/users/{self.user_id}/locations/{location_id}"
+        )
+        return Location.model_validate(response["data"][0])
+
     async def query_water_usage(
         self,
         device_id: str,
@@ -341,13 +890,14 @@ class FlumeClient:
         since_datetime: Optional[str] = None,
         until_datetime: Optional[str] = None,
         operation: str = "SUM",
-        units: str = "GALLONS"
+        units: str = "GALLONS",
+        validate: bool = True,
     ) -> Union[List[List[WaterUsageReading]], List[WaterUsageReading]]:
         """Query water usage data for a device.
-        
+
         This method accepts either a list of WaterUsageQuery objects or
         simple parameters for a single query.
-        
+
         Args:
             device_id: Device ID
             queries: Either a list of WaterUsageQuery objects or a bucket string
@@ -355,10 +905,72 @@ class FlumeClient:
             until_datetime: End time (only used if queries is a string)
             operation: Aggregation operation (only used if queries is a string)
             units: Units for the data (only used if queries is a string)
-            
+            validate: Validate each reading; pass False to build readings
+                from the API response without validation, which is much
+                faster for long minute-bucket queries
+
         Returns:
             List of water usage readings
         """
+        data = await self._post_queries(
+            device_id, queries, since_datetime, until_datetime, operation, units
+        )
+
+        if validate:
+            readings = _QUERY_READINGS.validate_python(data)
+        else:
+            construct = WaterUsageReading.model_construct
+            readings = [
+                [
+                    construct(datetime=r["datetime"], value=float(r["value"]))
+                    for r in query_data
+                ]
+                for query_data in data
+            ]
+
+        # If single query, return flat list
+        return readings[0] if len(readings) == 1 else readings
+
+    async def query_water_usage_columns(
+        self,
+        device_id: str,
+        queries: Union[List[WaterUsageQuery], str],
+        since_datetime: Optional[str] = None,
+        until_datetime: Optional[str] = None,
+        operation: str = "SUM",
+        units: str = "GALLONS",
+    ) -> List[Tuple[List[str], array]]:
+        """Query water usage data for a device as columns.
+
+        Takes the same arguments as query_water_usage, but returns each
+        query's readings as a list of timestamps and a float64 array of
+        values instead of one model per reading. The values array supports
+        the buffer protocol, e.g. ``numpy.frombuffer(values)``.
+
+        Returns:
+            List of (datetimes, values) tuples, one per query
+        """
+        data = await self._post_queries(
+            device_id, queries, since_datetime, until_datetime, operation, units
+        )
+        return [
+            (
+                [reading["datetime"] for reading in query_data],
+                array("d", [reading["value"] for reading in query_data]),
+            )
+            for query_data in data
+        ]
+
+    async def _post_queries(
+        self,
+        device_id: str,
+        queries: Union[List[WaterUsageQuery], str],
+        since_datetime: Optional[str],
+        until_datetime: Optional[str],
+        operation: str,
+        units: str,
+    ) -> List[List[Dict[str, Any]]]:
+        """Send water usage queries and return the raw readings of each."""
         if isinstance(queries, str):
             # Simple query mode
             query = WaterUsageQuery(
@@ -367,26 +979,28 @@ class FlumeClient:
                 since_datetime=since_datetime,
                 until_datetime=until_datetime,
                 operation=operation,
-                units=units
+                units=units,
             )
             queries = [query]
         elif not isinstance(queries, list):
-            raise ValueError("queries must be either a string or list of WaterUsageQuery")
+            raise ValueError(
+                "queries must be either a string or list of WaterUsageQuery"
+            )
 
+        # Splice the cached JSON of each query into the body rather than
+        # serializing the same queries again on every poll
+        body = (
+            b'{"queries":['
+            + b",".join(query.request_json() for query in queries)
+            + b"]}"
+        )
         response = await self._request(
             "POST",
             f"/users/{self.user_id}/devices/{device_id}/queries",
-            json={"queries": [query.model_dump() for query in queries]},
+            data=body,
         )
+        return response["data"]
 
-        readings = []
-        for query_data in response["data"]:
-            query_readings = [WaterUsageReading(**reading) for reading in query_data]
-            readings.append(query_readings)
-        
-        # If single query, return flat list
-        return readings[0] if len(readings) == 1 else readings
-    
     async def get_current_flow(self, device_id: str) -> Dict[str, Any]:
         """Get the current flow status for a device.
 
@@ -405,113 +1019,390 @@ class FlumeClient:
             if not response.get("data"):
                 raise FlumeAPIError("No data returned from current flow query")
             return response["data"][0]
-        except Exception as e:
-            warning_logger.error(f"Failed to get current flow for device {device_id}: {str(e)}")
+        except (
+            aiohttp.ClientError,
+            FlumeAuthError,
+            FlumeAPIError,
+            asyncio.TimeoutError,
+        ) as e:
+            warning_logger.error(
+                f"Failed to get current flow for device {device_id}: {str(e)}"
+            )
             raise
-    
+
     async def get_usage_alerts(self, **kwargs) -> List[UsageAlert]:
         """Get all usage alerts for the user."""
-        params = {
-            "limit": kwargs.get("limit", 50),
-            "offset": kwargs.get("offset", 0),
-            "sort_field": kwargs.get("sort_field", "triggered_datetime"),
-            "sort_direction": kwargs.get("sort_direction", "ASC"),
-        }
-        if "device_id" in kwargs:
-            params["device_id"] = kwargs["device_id"]
-        response = await self._request("GET", f"/users/{self.user_id}/usage-alerts", params=params)
-        return [UsageAlert(**alert) for alert in response["data"]]
-    
+        response = await self._request(
+            "GET",
+            f"/users/{self.user_id}/usage-alerts",
+            params=_alert_list_params(kwargs),
+        )
+        return _USAGE_ALERTS.validate_python(response["data"])
+
+    async def get_all_usage_alerts(
+        self, page_size: int = 50, **kwargs
+    ) -> List[UsageAlert]:
+        """Get every usage alert for the user, fetching pages concurrently.
+
+        Args:
+            page_size: Number of alerts per request
+            **kwargs: Filter and sort options of get_usage_alerts
+        """
+        data = await self._get_all_pages(
+            f"/users/{self.user_id}/usage-alerts", _alert_list_params(kwargs), page_size
+        )
+        return _USAGE_ALERTS.validate_python(data)
+
+    async def _get_all_pages(
+        self, endpoint: str, params: Dict[str, Any], page_size: int
+    ) -> List[Dict[str, Any]]:
+        """Fetch every page of a list endpoint.
+
+        When the first page reports the total number of items, the remaining
+        pages are requested concurrently. Otherwise pages are requested one
+        after another until one comes back short; ``count`` only covers the
+        current page.
+        """
+        first = await self._request(
+            "GET", endpoint, params=dict(params, limit=page_size, offset=0)
+        )
+        items = list(first["data"])
+        total = (first.get("pagination") or {}).get("total")
+        if total is None:
+            page = first["data"]
+            offset = page_size
+            while len(page) >= page_size:
+                page = (
+                    await self._request(
+                        "GET",
+                        endpoint,
+                        params=dict(params, limit=page_size, offset=offset),
+                    )
+                )["data"]
+                items.extend(page)
+                offset += page_size
+            return items
+        if total <= len(items):
+            return items
+
+        pages = await asyncio.gather(
+            *(
+                self._request(
+                    "GET", endpoint, params=dict(params, limit=page_size, offset=offset)
+                )
+                for offset in range(page_size, total, page_size)
+            )
+        )
+        for page in pages:
+            items.extend(page["data"])
+        return items
+
     async def get_alert_rules(self, device_id: str, **kwargs) -> List[UsageAlertRule]:
         """Get all alert rules for a device."""
-        params = {
-            "limit": kwargs.get("limit", 50),
-            "offset": kwargs.get("offset", 0),
-            "sort_field": kwargs.get("sort_field", "id"),
-            "sort_direction": kwargs.get("sort_direction", "ASC"),
-        }
+        params = _list_params(kwargs)
         response = await self._request(
             "GET",
             f"/users/{self.user_id}/devices/{device_id}/rules/usage-alerts",
             params=params,
         )
-        return [UsageAlertRule(**rule) for rule in response["data"]]
-    
+        return _ALERT_RULES.validate_python(response["data"])
+
     async def get_alert_rule(self, device_id: str, rule_id: str) -> UsageAlertRule:
         """Get a specific alert rule by ID."""
         response = await self._request(
             "GET",
             f"/users/{self.user_id}/devices/{device_id}/rules/usage-alerts/{rule_id}",
         )
-        return UsageAlertRule(**response["data"][0])
-    
+        return UsageAlertRule.model_validate(response["data"][0])
+
     async def write_to_influxdb(
         self,
         device_id: str,
         flow_data: Dict[str, Any],
-        measurement: Optional[str] = None
+        measurement: Optional[str] = None,
     ) -> None:
         """Write flow data to InfluxDB.
-        
+
+        Points are buffered and written in batches together with their cache
+        entries once ``batch_size`` readings are pending or ``flush_interval``
+        seconds have passed, so this returns before the data reaches InfluxDB.
+        Call flush() to write buffered points immediately.
+
         Args:
             device_id: Device ID
             flow_data: Flow data from get_current_flow
             measurement: Optional override for measurement name
         """
-        if not self._write_api:
+        if not self._influxdb_write_url:
             raise FlumeInfluxDBError("InfluxDB client not initialized")
 
-        # Store in cache if available
-        if self.cache:
-            self.cache.store(device_id, datetime.fromisoformat(flow_data["datetime"]), flow_data)
+        if self.skip_unchanged:
+            sample = (flow_data["gpm"], flow_data["active"])
+            if self._last_samples.get(device_id) == sample:
+                return
+            self._last_samples[device_id] = sample
 
-        measurement = measurement or self.influxdb_measurement
-        timestamp = datetime.fromisoformat(flow_data['datetime'].replace(' ', 'T'))
+        # Parsed once for both the line protocol record and the cache entry;
+        # fromisoformat accepts the space separator Flume uses
+        timestamp = datetime.fromisoformat(flow_data["datetime"])
 
-        point = Point(measurement) \
-            .tag("device_id", device_id) \
-            .field("flow_rate", float(flow_data['gpm'])) \
-            .field("active", flow_data['active']) \
-            .time(timestamp)
+        prefix = self._prefix_for(measurement or self.influxdb_measurement)
+        line = _to_line_protocol(
+            prefix,
+            device_id,
+            float(flow_data["gpm"]),
+            flow_data["active"],
+            _to_nanoseconds(timestamp),
+        )
 
-        try:
-            print(f"Writing to InfluxDB: {point}")
-            self._write_api.write(
-                bucket=self.influxdb_bucket,
-                org=self.influxdb_org,
-                record=point
-            )
-        except Exception as e:
-            warning_logger.error(f"Failed to write to InfluxDB: {e}")
-            # Data is still in cache even if InfluxDB write fails
+        if debug_logger.isEnabledFor(logging.DEBUG):
+            debug_logger.debug("Writing to InfluxDB: %s", line)
+        await self._batch_writer.put((device_id, timestamp, flow_data, line))
+
+    async def _write_batch(self, batch: List[Any]) -> None:
+        """Write a batch of buffered flow data to the cache and InfluxDB.
+
+        Args:
+            batch: List of (device_id, timestamp, flow_data, line) tuples
+        """
+        # The InfluxDB POST and the cache's worker thread overlap; neither
+        # failure keeps the batch from reaching the other store
+        influxdb_result, cache_result = await asyncio.gather(
+            self._write_lines([line for _, _, _, line in batch]),
+            self.cache.astore_many(
+                (device_id, timestamp, flow_data)
+                for device_id, timestamp, flow_data, _ in batch
+            ),
+            return_exceptions=True,
+        )
+        if isinstance(influxdb_result, Exception):
+            warning_logger.error(f"Failed to write to InfluxDB: {influxdb_result}")
+        if isinstance(cache_result, Exception):
+            warning_logger.error(f"Failed to write to cache: {cache_result}")
+
+    async def write_readings_to_influxdb(
+        self,
+        device_id: str,
+        readings: List[WaterUsageReading],
+        measurement: Optional[str] = None,
+    ) -> None:
+        """Write water usage readings to InfluxDB as a single batch.
+
+        Args:
+            device_id: Device ID
+            readings: Readings from query_water_usage
+            measurement: Optional override for measurement name
+        """
+        await self.write_usage_columns_to_influxdb(
+            device_id,
+            [reading.datetime for reading in readings],
+            [reading.value for reading in readings],
+            measurement,
+        )
+
+    async def write_usage_columns_to_influxdb(
+        self,
+        device_id: str,
+        datetimes: Sequence[str],
+        values: Sequence[float],
+        measurement: Optional[str] = None,
+    ) -> None:
+        """Write water usage columns to InfluxDB as a single batch.
+
+        Args:
+            device_id: Device ID
+            datetimes: Reading timestamps from query_water_usage_columns
+            values: Reading values from query_water_usage_columns
+            measurement: Optional override for measurement name
+        """
+        if not self._influxdb_write_url:
+            raise FlumeInfluxDBError("InfluxDB client not initialized")
+
+        prefix = self._prefix_for(measurement or self.influxdb_measurement)
+        await self._write_lines(
+            [
+                _to_usage_line_protocol(prefix, device_id, value, timestamp_ns)
+                for timestamp_ns, value in zip(
+                    _datetimes_to_nanoseconds(datetimes), values
+                )
+            ]
+        )
+
+    def _prefix_for(self, measurement: str) -> str:
+        """Get the cached line protocol prefix of a measurement."""
+        prefix = self._line_prefixes.get(measurement)
+        if prefix is None:
+            prefix = self._line_prefixes[measurement] = _line_prefix(measurement)
+        return prefix
+
+    async def _write_lines(self, lines: List[str]) -> None:
+        """POST line protocol records to InfluxDB in one request.
+
+        Connection errors and retryable statuses are retried with the same
+        backoff as Flume API requests.
+
+        Raises:
+            FlumeInfluxDBError: If InfluxDB did not accept the records
+        """
+        if not self._session:
+            self._session = self._create_session()
+
+        # Line protocol compresses well; the lowest level gets most of the
+        # saving for a fraction of the CPU time on the event loop
+        body = gzip.compress("\n".join(lines).encode(), compresslevel=1)
+        for attempt in range(self.MAX_RETRIES + 1):
+            last_attempt = attempt == self.MAX_RETRIES
+            retry_after = None
+            try:
+                async with self._session.post(
+                    self._influxdb_write_url, data=body, headers=self._influxdb_headers
+                ) as response:
+                    if response.status < 300:
+                        return
+                    status = response.status
+                    text = await response.text()
+                    retry_after = _parse_retry_after(
+                        response.headers.get("Retry-After")
+                    )
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if last_attempt:
+                    raise FlumeInfluxDBError(f"InfluxDB write failed: {str(e)}")
+                warning_logger.warning(f"InfluxDB write failed, retrying: {str(e)}")
+            except aiohttp.ClientError as e:
+                raise FlumeInfluxDBError(f"InfluxDB write failed: {str(e)}")
+            else:
+                if last_attempt or status not in self.RETRY_STATUSES:
+                    raise FlumeInfluxDBError(
+                        f"InfluxDB write failed: {status}\nResponse: {text}"
+                    )
+                warning_logger.warning(f"InfluxDB write failed with {status}, retrying")
+
+            if retry_after is None:
+                retry_after = self._retry_delay(attempt)
+            await asyncio.sleep(retry_after)
+
+    async def flush(self) -> None:
+        """Write any buffered flow data to the cache and InfluxDB."""
+        if self._batch_writer:
+            await self._batch_writer.flush()
 
     async def monitor_and_store(
         self,
         device_id: str,
-        interval: int = 30
+        interval: int = 30,
+        *,
+        iterations: Optional[int] = None,
+        stop_event: Optional[asyncio.Event] = None,
     ) -> None:
-        """Monitor device flow and store data in InfluxDB."""
-        if not self._write_api:
+        """Monitor device flow and store data in InfluxDB.
+
+        Runs until cancelled unless ``iterations`` or ``stop_event`` ends it
+        first; buffered readings are flushed before returning.
+
+        Args:
+            device_id: ID of the device to monitor
+            interval: Seconds between readings
+            iterations: Number of readings to take, or None for no limit
+            stop_event: Event that stops monitoring once set, even mid-interval
+        """
+        if not self._influxdb_write_url:
             warning_logger.error("InfluxDB client not initialized")
             raise FlumeInfluxDBError("InfluxDB client not initialized")
 
         main_logger.info(f"Starting monitoring for device {device_id}")
-        while True:
+        polls = 0
+        delay = 0.0
+        while iterations is None or polls < iterations:
+            if await _sleep_unless_set(delay, stop_event):
+                break
             try:
                 flow_data = await self.get_current_flow(device_id)
                 await self.write_to_influxdb(device_id, flow_data)
-                debug_logger.debug(f"Successfully wrote flow data for device {device_id}")
-                await asyncio.sleep(interval)
+                debug_logger.debug(
+                    "Successfully wrote flow data for device %s", device_id
+                )
+                delay = interval
             except Exception as e:
                 warning_logger.error(f"Error monitoring device {device_id}: {e}")
-                await asyncio.sleep(5)  # Wait before retrying
+                delay = 5  # Wait before retrying
+            polls += 1
+
+        await self.flush()
+
+    async def monitor_many(
+        self,
+        device_ids: List[str],
+        interval: int = 30,
+        *,
+        iterations: Optional[int] = None,
+        stop_event: Optional[asyncio.Event] = None,
+    ) -> None:
+        """Monitor several devices and store their data in InfluxDB.
+
+        Each tick fetches the current flow of all devices concurrently over
+        the shared connection pool and writes the readings as one batch.
+        Ticks are ``interval`` seconds apart on the monotonic clock. Runs
+        until cancelled unless ``iterations`` or ``stop_event`` ends it first.
+
+        Args:
+            device_ids: IDs of the devices to monitor
+            interval: Seconds between ticks
+            iterations: Number of ticks to run, or None for no limit
+            stop_event: Event that stops monitoring once set, even mid-interval
+        """
+        if not self._influxdb_write_url:
+            warning_logger.error("InfluxDB client not initialized")
+            raise FlumeInfluxDBError("InfluxDB client not initialized")
+
+        main_logger.info(f"Starting monitoring for devices {', '.join(device_ids)}")
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        ticks = 0
+        delay = 0.0
+        while iterations is None or ticks < iterations:
+            if await _sleep_unless_set(delay, stop_event):
+                break
+            flows = await asyncio.gather(
+                *(self.get_current_flow(device_id) for device_id in device_ids),
+                return_exceptions=True,
+            )
+            try:
+                for device_id, flow_data in zip(device_ids, flows):
+                    if isinstance(flow_data, Exception):
+                        warning_logger.error(
+                            f"Error monitoring device {device_id}: {flow_data}"
+                        )
+                        continue
+                    await self.write_to_influxdb(device_id, flow_data)
+                await self.flush()
+                debug_logger.debug(
+                    "Successfully wrote flow data for %d devices", len(device_ids)
+                )
+            except Exception as e:
+                warning_logger.error(f"Error writing flow data: {e}")
+            # Schedule against fixed ticks so polling doesn't drift; after an
+            # overrun, skip the missed ticks rather than firing a burst
+            ticks += 1
+            next_tick += interval
+            now = loop.time()
+            if next_tick < now and interval > 0:
+                next_tick += (now - next_tick) // interval * interval + interval
+            delay = max(next_tick - now, 0.0)
 
     async def close(self) -> None:
         """Close the client session."""
+        if self._refresh_task and not self._refresh_task.done():
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+
+        if self._batch_writer:
+            await self._batch_writer.close()
+
         if self._session:
             await self._session.close()
             self._session = None
 
-        if self._influxdb_client:
-            self._influxdb_client.close()
-            self._influxdb_client = None 
\ No newline at end of file
+        self.cache.close()
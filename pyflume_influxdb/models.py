@@ -1,14 +1,15 @@
 """Models for the Flume API."""
+
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, PrivateAttr, field_validator
 from pydantic.json_schema import JsonSchemaValue
 
 
 class FlumeResponse(BaseModel):
     """Base response model for Flume API."""
-    
+
     success: bool = Field(True, description="Whether the request was successful")
     code: int = Field(0, description="Response code")
     message: str = Field(..., description="Response message")
@@ -16,12 +17,14 @@ class FlumeResponse(BaseModel):
     http_message: str = Field("OK", description="HTTP status message")
     detailed: Optional[List[str]] = Field(None, description="Detailed error messages")
     count: int = Field(0, description="Number of items in data")
-    pagination: Optional[Dict[str, Any]] = Field(None, description="Pagination information")
+    pagination: Optional[Dict[str, Any]] = Field(
+        None, description="Pagination information"
+    )
 
 
 class Device(BaseModel):
     """Represents a Flume water sensor device."""
-    
+
     id: str = Field(..., description="The unique identifier of the device")
     type: int = Field(..., description="Device type (1: Bridge, 2: Water Sensor)")
     location_id: Optional[int] = Field(None, description="ID of associated location")
@@ -36,11 +39,13 @@ class Device(BaseModel):
 
 class Location(BaseModel):
     """Represents a Flume device location."""
-    
+
     id: int = Field(..., description="Location ID")
     user_id: int = Field(..., description="User ID")
     name: str = Field(..., description="Location name")
-    primary_location: bool = Field(False, description="Whether this is primary location")
+    primary_location: bool = Field(
+        False, description="Whether this is primary location"
+    )
     address: Optional[str] = Field(None, description="Street address")
     address_2: Optional[str] = Field(None, description="Additional address info")
     city: Optional[str] = Field(None, description="City")
@@ -54,7 +59,7 @@ class Location(BaseModel):
 
 class WaterUsageQuery(BaseModel):
     """Query parameters for water usage data."""
-    
+
     request_id: str = Field(..., description="Unique identifier for the query")
     bucket: str = Field(..., description="Time bucket size")
     since_datetime: str = Field(..., description="Start time for query")
@@ -65,44 +70,81 @@ class WaterUsageQuery(BaseModel):
     units: str = Field("GALLONS", description="Units of measurement")
     types: List[str] = Field(default_factory=list, description="Water types to include")
 
+    _json: Optional[bytes] = PrivateAttr(default=None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Set an attribute, discarding the cached request body."""
+        super().__setattr__(name, value)
+        if not name.startswith("_"):
+            self._json = None
+
+    def model_copy(
+        self, *, update: Optional[Dict[str, Any]] = None, deep: bool = False
+    ) -> "WaterUsageQuery":
+        """Copy the query without its cached request body."""
+        copy = super().model_copy(update=update, deep=deep)
+        copy._json = None
+        return copy
+
+    def request_json(self) -> bytes:
+        """Get the query as serialized JSON, as sent to the API.
+
+        The JSON is cached so queries reused across requests are only
+        serialized once. Assigning a field clears the cache; mutating
+        ``types`` in place does not.
+        """
+        if self._json is None:
+            self._json = self.model_dump_json().encode()
+        return self._json
+
 
 class WaterUsageReading(BaseModel):
     """Individual water usage reading."""
-    
+
     datetime: str = Field(..., description="Timestamp of reading")
     value: float = Field(..., description="Water usage value")
 
 
 class UsageAlert(BaseModel):
     """Water usage alert."""
-    
+
     id: int = Field(..., description="Alert ID")
     device_id: str = Field(..., description="Device ID")
     triggered_datetime: datetime = Field(..., description="When alert was triggered")
     flume_leak: bool = Field(False, description="Whether Flume detected this as a leak")
     query: WaterUsageQuery = Field(..., description="Query that triggered the alert")
-    event_rule_name: str = Field(..., description="Name of the rule that triggered alert")
+    event_rule_name: str = Field(
+        ..., description="Name of the rule that triggered alert"
+    )
 
 
 class UsageAlertRule(BaseModel):
     """Model for a usage alert rule."""
 
-    id: Union[str, int]
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
+    id: str
     name: str
     active: bool
     flow_rate: float
     duration: int
     notify_every: int
 
+    @field_validator("id", mode="before")
+    @classmethod
+    def _coerce_id(cls, value: Any) -> str:
+        """Accept numeric IDs without a union validator on every rule."""
+        return value if isinstance(value, str) else str(value)
+
 
 class WaterUsage(BaseModel):
     """Represents water usage data from a Flume device."""
-    
+
     device_id: str = Field(..., description="The ID of the device reporting usage")
     timestamp: datetime = Field(..., description="The timestamp of the measurement")
     value: float = Field(..., description="The water usage value in gallons")
     units: str = Field(default="gallons", description="The units of measurement")
-    
+
     model_config = ConfigDict(
         ser_json_timedelta="iso8601",
         ser_json_bytes="base64",
@@ -112,10 +154,10 @@ class WaterUsage(BaseModel):
                     "device_id": "123",
                     "timestamp": "2024-03-15T10:00:00",
                     "value": 1.5,
-                    "units": "gallons"
+                    "units": "gallons",
                 }
             ]
-        }
+        },
     )
 
     def model_dump_json(self, **kwargs) -> str:
@@ -123,4 +165,4 @@ class WaterUsage(BaseModel):
         data = self.model_dump()
         if isinstance(data["timestamp"], datetime):
             data["timestamp"] = data["timestamp"].isoformat()
-        return super().model_dump_json(**kwargs) 
\ No newline at end of file
+        return super().model_dump_json(**kwargs)
@@ -0,0 +1,100 @@
+"""Client-side throttling for Flume API requests."""
+
+import asyncio
+import collections
+import time
+from typing import Deque, Optional
+
+
+class AdaptiveLimiter:
+    """Concurrency limit adjusted with additive increase, multiplicative decrease.
+
+    Use as an async context manager around each request. Successful responses
+    raise the limit by ``increase`` up to ``maximum``; overload responses
+    (429 or 5xx) scale it by ``decrease`` down to ``minimum``.
+    """
+
+    def __init__(
+        self,
+        initial: int = 8,
+        minimum: int = 1,
+        maximum: int = 32,
+        increase: float = 0.5,
+        decrease: float = 0.5,
+    ) -> None:
+        """Initialize the limiter.
+
+        Args:
+            initial: Starting number of concurrent requests
+            minimum: Lowest the limit can shrink to
+            maximum: Highest the limit can grow to
+            increase: Amount added to the limit per successful response
+            decrease: Factor applied to the limit per overload response
+        """
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self._limit = float(min(max(initial, minimum), maximum))
+        self._in_flight = 0
+        self._cond: Optional[asyncio.Condition] = None
+
+    @property
+    def limit(self) -> int:
+        """Current number of requests allowed to run concurrently."""
+        return int(self._limit)
+
+    async def __aenter__(self) -> "AdaptiveLimiter":
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        async with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def on_success(self) -> None:
+        """Additively raise the limit after a successful response."""
+        self._limit = min(self._limit + self.increase, float(self.maximum))
+
+    def on_overload(self) -> None:
+        """Multiplicatively lower the limit after the server pushed back."""
+        self._limit = max(self._limit * self.decrease, float(self.minimum))
+
+
+class SlidingWindowLimiter:
+    """Cap the number of requests started in any ``window`` seconds."""
+
+    def __init__(self, max_requests: int, window: float = 60.0) -> None:
+        """Initialize the limiter.
+
+        Args:
+            max_requests: Maximum number of requests per window
+            window: Length of the window in seconds
+        """
+        self.max_requests = max_requests
+        self.window = window
+        self._starts: Deque[float] = collections.deque()
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def wait_if_throttled(self) -> None:
+        """Wait until another request fits in the window, then record it."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            now = time.monotonic()
+            while self._starts and now - self._starts[0] >= self.window:
+                self._starts.popleft()
+
+            if len(self._starts) >= self.max_requests:
+                await asyncio.sleep(self._starts[0] + self.window - now)
+                self._starts.popleft()
+                now = time.monotonic()
+
+            self._starts.append(now)
@@ -0,0 +1,78 @@
+"""Tests for the batch module."""
+
+import asyncio
+
+from pyflume_influxdb.batch import BatchWriter
+
+
+class RecordingSink:
+    """Sink that records every batch it receives."""
+
+    def __init__(self):
+        self.batches = []
+
+    async def __call__(self, batch):
+        self.batches.append(batch)
+
+
+async def test_flush_on_batch_size():
+    """Test that a full batch is written immediately."""
+    sink = RecordingSink()
+    writer = BatchWriter(sink, batch_size=3, flush_interval=60)
+
+    for i in range(7):
+        await writer.put(i)
+
+    assert sink.batches == [[0, 1, 2], [3, 4, 5]]
+    assert len(writer) == 1
+
+    await writer.close()
+    assert sink.batches[-1] == [6]
+
+
+async def test_flush_on_interval():
+    """Test that buffered records are written after the flush interval."""
+    sink = RecordingSink()
+    writer = BatchWriter(sink, batch_size=100, flush_interval=0.01)
+
+    await writer.put("a")
+    await writer.put("b")
+    await asyncio.sleep(0.05)
+
+    assert sink.batches == [["a", "b"]]
+    await writer.close()
+
+
+async def test_close_without_records():
+    """Test that closing an unused writer does not call the sink."""
+    sink = RecordingSink()
+    writer = BatchWriter(sink)
+
+    await writer.close()
+    assert sink.batches == []
+
+
+async def test_close_during_in_flight_flush():
+    """Test that closing while the periodic flush is writing loses no records."""
+    started = asyncio.Event()
+    release = asyncio.Event()
+    written = []
+
+    async def slow_sink(batch):
+        started.set()
+        await release.wait()
+        written.append(batch)
+
+    writer = BatchWriter(slow_sink, batch_size=100, flush_interval=0.01)
+    await writer.put("a")
+    await started.wait()
+    await writer.put("b")
+
+    close = asyncio.ensure_future(writer.close())
+    await asyncio.sleep(0.01)
+    assert not close.done()
+    release.set()
+    await close
+
+    assert written == [["a"], ["b"]]
+    assert len(writer) == 0
@@ -1,13 +1,14 @@
 """Tests for the cache module."""
+
 import os
 import json
 import sqlite3
-from datetime import datetime, timedelta
-from pathlib import Path
+from datetime import datetime, timedelta, timezone
 
 import pytest
 
-from pyflume_influxdb.cache import FlumeCache
+from pyflume_influxdb.cache import FlumeCache, _from_epoch_us, _to_epoch_us, _utcnow
+from pyflume_influxdb.client import _to_nanoseconds
 
 
 @pytest.fixture
@@ -27,31 +28,43 @@ def cache(temp_cache_dir):
 def test_cache_initialization(temp_cache_dir):
     """Test that the cache initializes correctly."""
     cache = FlumeCache(temp_cache_dir)
-    
+
     # Check that the cache directory exists
     assert os.path.exists(temp_cache_dir)
-    
+
     # Check that the database file exists
     db_path = os.path.join(temp_cache_dir, "cache.db")
     assert os.path.exists(db_path)
-    
+
     # Check that the table exists
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='flow_data'")
+    cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name='flow_data'"
+    )
     assert cursor.fetchone() is not None
     conn.close()
 
 
+def test_naive_timestamps_are_utc():
+    """Test that the cache and InfluxDB writes agree on naive timestamps."""
+    timestamp = datetime(2025, 3, 15, 3, 24, 34, 549021)
+    assert _to_epoch_us(timestamp) * 1000 == _to_nanoseconds(timestamp)
+    assert _to_epoch_us(timestamp.replace(tzinfo=timezone.utc)) == _to_epoch_us(
+        timestamp
+    )
+    assert _from_epoch_us(_to_epoch_us(timestamp)) == timestamp
+
+
 def test_store_and_retrieve(cache):
     """Test storing and retrieving data from the cache."""
     device_id = "test_device"
-    timestamp = datetime.now()
+    timestamp = _utcnow()
     data = {"gpm": 1.5, "active": True}
-    
+
     # Store data
     cache.store(device_id, timestamp, data)
-    
+
     # Retrieve data
     retrieved_data = cache.get(device_id, timestamp)
     assert retrieved_data is not None
@@ -62,41 +75,44 @@ def test_store_and_retrieve(cache):
 def test_get_recent_data(cache):
     """Test retrieving recent data from the cache."""
     device_id = "test_device"
-    now = datetime.now()
-    
+    now = _utcnow()
+
     # Store multiple data points
     data_points = [
-        (now - timedelta(minutes=i), {"gpm": i * 0.5, "active": True})
-        for i in range(5)
+        (now - timedelta(minutes=i), {"gpm": i * 0.5, "active": True}) for i in range(5)
     ]
-    
+
     for timestamp, data in data_points:
         cache.store(device_id, timestamp, data)
-    
+
     # Get recent data
     recent_data = cache.get_recent(device_id, hours=1)
     assert len(recent_data) == 5
-    
+
     # Check that data is ordered by timestamp
     timestamps = [entry[0] for entry in recent_data]
     assert timestamps == sorted(timestamps, reverse=True)
 
+    # Limit returns only the newest entries
+    limited = cache.get_recent(device_id, hours=1, limit=2)
+    assert [entry[0] for entry in limited] == timestamps[:2]
+
 
 def test_cleanup_old_data(cache):
     """Test cleaning up old data from the cache."""
     device_id = "test_device"
-    now = datetime.now()
-    
+    now = _utcnow()
+
     # Store some old and new data
     old_timestamp = now - timedelta(days=2)
     new_timestamp = now - timedelta(minutes=30)
-    
+
     cache.store(device_id, old_timestamp, {"gpm": 1.0, "active": False})
     cache.store(device_id, new_timestamp, {"gpm": 2.0, "active": True})
-    
+
     # Clean up data older than 1 day
     cache.cleanup(max_age_hours=24)
-    
+
     # Check that old data is gone but new data remains
     assert cache.get(device_id, old_timestamp) is None
     assert cache.get(device_id, new_timestamp) is not None
@@ -105,25 +121,169 @@ def test_cleanup_old_data(cache):
 def test_cache_handles_missing_data(cache):
     """Test that the cache handles missing data gracefully."""
     device_id = "nonexistent_device"
-    timestamp = datetime.now()
-    
+    timestamp = _utcnow()
+
     # Try to get nonexistent data
     assert cache.get(device_id, timestamp) is None
     assert len(cache.get_recent(device_id, hours=1)) == 0
 
 
+def test_store_and_get_token(cache):
+    """Test that the latest token per account is kept."""
+    assert cache.get_token("client", "user") is None
+
+    cache.store_token("client", "user", "old", 100)
+    cache.store_token("client", "user", "new", 200)
+    cache.store_token("client", "other", "theirs", 300)
+
+    assert cache.get_token("client", "user") == ("new", 200)
+    assert cache.get_token("client", "other") == ("theirs", 300)
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX permissions")
+def test_cache_is_private_to_owner(tmp_path):
+    """Test that the cache directory and database are only accessible by the owner."""
+    cache_dir = tmp_path / "private"
+    cache = FlumeCache(str(cache_dir))
+    cache.store_token("client", "user", "token", 100)
+
+    assert cache_dir.stat().st_mode & 0o777 == 0o700
+    for path in cache_dir.iterdir():
+        assert path.stat().st_mode & 0o777 == 0o600
+    cache.close()
+
+
 def test_cache_handles_multiple_devices(cache):
     """Test that the cache can handle data from multiple devices."""
     devices = ["device1", "device2"]
-    timestamp = datetime.now()
-    
+    timestamp = _utcnow()
+
     # Store data for multiple devices
     for device_id in devices:
         cache.store(device_id, timestamp, {"gpm": 1.0, "active": True})
-    
+
     # Check that data for each device can be retrieved
     for device_id in devices:
         data = cache.get(device_id, timestamp)
         assert data is not None
         assert data["gpm"] == 1.0
-        assert data["active"] is True 
\ No newline at end of file
+        assert data["active"] is True
+
+
+def test_cache_close(cache):
+    """Test that closing the cache releases its connection."""
+    cache.store("test_device", _utcnow(), {"gpm": 1.0, "active": True})
+    cache.close()
+    assert cache._conn is None
+
+    # Closing twice is harmless
+    cache.close()
+
+
+def test_store_many(cache):
+    """Test storing multiple entries in one call."""
+    now = _utcnow()
+    rows = [
+        ("device1", now, {"gpm": 1.0, "active": True}),
+        ("device2", now, {"gpm": 2.0, "active": True}),
+        ("device1", now - timedelta(minutes=1), {"gpm": 0.0, "active": False}),
+    ]
+
+    cache.store_many(rows)
+
+    assert cache.get("device2", now)["gpm"] == 2.0
+    assert len(cache.get_recent("device1", hours=1)) == 2
+
+
+def test_migrates_text_timestamps(temp_cache_dir):
+    """Test that a cache with ISO-8601 timestamps is converted on open."""
+    timestamp = _utcnow().replace(microsecond=123456)
+    conn = sqlite3.connect(os.path.join(temp_cache_dir, "cache.db"))
+    conn.execute("""
+        CREATE TABLE flow_data (
+            device_id TEXT,
+            timestamp TEXT,
+            data TEXT,
+            PRIMARY KEY (device_id, timestamp)
+        )
+    """)
+    conn.execute(
+        "INSERT INTO flow_data VALUES (?, ?, ?)",
+        (
+            "test_device",
+            timestamp.isoformat(),
+            json.dumps({"gpm": 1.5, "active": True}),
+        ),
+    )
+    conn.commit()
+    conn.close()
+
+    cache = FlumeCache(temp_cache_dir)
+
+    assert cache.get("test_device", timestamp) == {"gpm": 1.5, "active": True}
+    assert cache.get_recent("test_device", hours=1)[0][0] == timestamp
+
+
+def test_failed_migration_is_rolled_back(temp_cache_dir):
+    """Test that a failed migration leaves the database unlocked and unchanged."""
+    conn = sqlite3.connect(os.path.join(temp_cache_dir, "cache.db"), timeout=0)
+    conn.execute("CREATE TABLE flow_data (device_id TEXT, timestamp TEXT, data TEXT)")
+    conn.execute(
+        "INSERT INTO flow_data VALUES ('test_device', 'not a timestamp', '{}')"
+    )
+    conn.commit()
+
+    with pytest.raises(ValueError):
+        FlumeCache(temp_cache_dir)
+
+    conn.execute("INSERT INTO flow_data VALUES ('test_device', 'still text', '{}')")
+    conn.commit()
+    assert conn.execute("SELECT COUNT(*) FROM flow_data").fetchone() == (2,)
+    conn.close()
+
+
+async def test_async_wrappers(cache):
+    """Test the executor-backed async cache methods."""
+    timestamp = _utcnow()
+
+    await cache.astore("device1", timestamp, {"gpm": 1.0, "active": True})
+    await cache.astore_many([("device2", timestamp, {"gpm": 2.0, "active": True})])
+
+    assert (await cache.aget("device1", timestamp))["gpm"] == 1.0
+    assert len(await cache.aget_recent("device2", hours=1)) == 1
+
+    await cache.acleanup(max_age_hours=0)
+    assert await cache.aget("device1", timestamp) is None
+
+
+def test_get_recent_frame(cache):
+    """Test retrieving recent data as a DataFrame."""
+    pd = pytest.importorskip("pandas")
+    now = _utcnow()
+    for i in range(3):
+        cache.store(
+            "test_device", now - timedelta(minutes=i), {"gpm": i * 0.5, "active": True}
+        )
+
+    frame = cache.get_recent_frame("test_device", hours=1)
+
+    assert list(frame.columns) == ["timestamp", "gpm", "active"]
+    assert frame["gpm"].tolist() == [0.0, 0.5, 1.0]
+    assert frame["timestamp"].iloc[0] == pd.Timestamp(now.astimezone())
+
+
+def test_get_recent_is_memoized_until_next_store(cache):
+    """Test that repeated get_recent calls reuse results until data changes."""
+    device_id = "test_device"
+    now = _utcnow()
+    cache.store(device_id, now - timedelta(minutes=1), {"gpm": 1.0, "active": True})
+
+    first = cache.get_recent(device_id, hours=1)
+    assert cache.get_recent(device_id, hours=1) == first
+    assert cache._recent_memo[device_id]
+
+    cache.store(device_id, now, {"gpm": 2.0, "active": True})
+    assert device_id not in cache._recent_memo
+
+    recent = cache.get_recent(device_id, hours=1)
+    assert [data["gpm"] for _, data in recent] == [2.0, 1.0]
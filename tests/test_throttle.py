@@ -0,0 +1,55 @@
+"""Tests for the throttle module."""
+
+import asyncio
+import time
+
+from pyflume_influxdb.throttle import AdaptiveLimiter, SlidingWindowLimiter
+
+
+def test_adaptive_limiter_aimd():
+    """Test that the limit grows additively and shrinks multiplicatively."""
+    limiter = AdaptiveLimiter(initial=4, minimum=1, maximum=6)
+
+    limiter.on_success()
+    limiter.on_success()
+    assert limiter.limit == 5
+
+    for _ in range(10):
+        limiter.on_success()
+    assert limiter.limit == 6
+
+    limiter.on_overload()
+    assert limiter.limit == 3
+
+    for _ in range(10):
+        limiter.on_overload()
+    assert limiter.limit == 1
+
+
+async def test_adaptive_limiter_caps_concurrency():
+    """Test that no more than the current limit run at once."""
+    limiter = AdaptiveLimiter(initial=2, maximum=2)
+    running = 0
+    peak = 0
+
+    async def worker():
+        nonlocal running, peak
+        async with limiter:
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*(worker() for _ in range(6)))
+    assert peak == 2
+
+
+async def test_sliding_window_limiter_waits():
+    """Test that requests beyond the window's budget are delayed."""
+    limiter = SlidingWindowLimiter(max_requests=2, window=0.1)
+
+    start = time.monotonic()
+    for _ in range(3):
+        await limiter.wait_if_throttled()
+
+    assert time.monotonic() - start >= 0.09